@@ -1,9 +1,11 @@
 import pandas as pd
 from pathlib import Path
 
-# Read the Excel file
+from src.data.snapshot import load_roster
+
+# Read the Excel file (columnar snapshot, rebuilt only when the xlsx changes)
 excel_path = Path("./data/jugadores.xlsx")
-df = pd.read_excel(excel_path)
+df = load_roster(excel_path)
 
 # Filter for our team
 team_name = "LUJISA GUADALAJARA BASKET"
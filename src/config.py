@@ -51,10 +51,61 @@ GOOGLE_DRIVE_CREDENTIALS_PATH = "credentials/google_drive_credentials.json"
 # Cache local para archivos descargados
 CACHE_DIR = DATA_DIR / "cache"
 DRIVE_CACHE_DIR = CACHE_DIR / "drive"
+DRIVE_BLOB_DIR = CACHE_DIR / "blobs"  # Contenido por md5 (enlazado desde la cache de Drive)
+
+# Snapshot columnar (Parquet) del Excel de jugadores
+ROSTER_SNAPSHOT_DIR = CACHE_DIR / "roster"
+
+# Catálogo persistente (SQLite) de carpetas y archivos de Google Drive
+DRIVE_CATALOG_DB = CACHE_DIR / "drive_catalog.sqlite3"
+
+# Documento de descubrimiento de la API de Drive (evita descargarlo/parsearlo en cada arranque)
+DRIVE_DISCOVERY_CACHE_FILE = CACHE_DIR / "drive_v3_discovery.json"
 
 # Configuración de cache
 CACHE_EXPIRY_HOURS = 24  # Renovar cache cada 24 horas
 USE_DRIVE_FIRST = True   # True: Priorizar Google Drive, False: Priorizar archivos locales
+DRIVE_SYNC_RETRY_SECONDS = 60  # Espera antes de reintentar una sincronización fallida (compartida por todas las sesiones)
+DRIVE_REFRESH_INTERVAL_MINUTES = 15  # Cada cuánto revalida la cache de Drive el hilo en segundo plano
+DRIVE_SYNC_LOCK_TIMEOUT = 300  # Segundos máximos esperando a que otro proceso termine de sincronizar
+DRIVE_CATALOG_TTL_MINUTES = 10  # Antigüedad máxima del catálogo en memoria del árbol de Drive
+DRIVE_MISSING_FILE_TTL_MINUTES = 30  # Tiempo que se recuerda que una imagen no existe en Drive
+DRIVE_CACHE_MAX_MB = 500  # Tamaño máximo de la cache de Drive (se expulsan los equipos menos usados)
+DRIVE_CACHE_PIN_MINUTES = 60  # Tiempo que un rival seleccionado queda protegido desde su último uso
+
+# Descargas concurrentes desde Google Drive (1 = secuencial)
+DRIVE_DOWNLOAD_WORKERS = 4
+
+# Tamaño de cada bloque al descargar de Drive directamente a disco (bytes)
+DRIVE_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Regulador de peticiones a la API de Drive (reintentos y concurrencia adaptativa)
+DRIVE_MAX_CONCURRENCY = 8        # Peticiones simultáneas máximas (se reduce a la mitad ante errores de cuota)
+DRIVE_MAX_RETRIES = 5            # Reintentos para errores transitorios (429, 5xx, red)
+DRIVE_BACKOFF_BASE_SECONDS = 0.5 # Espera base del backoff exponencial (con jitter)
+DRIVE_BACKOFF_MAX_SECONDS = 32   # Espera máxima entre reintentos
+DRIVE_TOKEN_REFRESH_MARGIN_SECONDS = 300  # Renovar el token de acceso 5 minutos antes de que caduque
+DRIVE_HTTP_TIMEOUT_SECONDS = 60  # Timeout de cada petición HTTP a Drive
+
+# ==============================
+# ===== IMÁGENES EXTERNAS =====
+# ==============================
+
+# Validación de URLs de la columna IMAGEN (imagenes.feb.es)
+IMAGE_PROBE_CACHE_FILE = CACHE_DIR / "image_probe.json"
+IMAGE_PROBE_TTL_HOURS = 24           # Validez de una URL confirmada como imagen
+IMAGE_PROBE_NEGATIVE_TTL_HOURS = 6   # Validez de una URL rechazada (reintentar antes)
+IMAGE_PROBE_ERROR_TTL_SECONDS = 60   # Espera tras un fallo de red o 5xx (no se guarda en disco)
+IMAGE_PROBE_MAX_WORKERS = 8          # Peticiones simultáneas como máximo
+IMAGE_PROBE_TIMEOUT = 4              # Segundos por petición
+
+# ==============================
+# ===== ESTADÍSTICAS ==========
+# ==============================
+
+# Minutos mínimos en la temporada para entrar en los percentiles de liga
+PERCENTILE_MIN_MINUTES = 60
+
 
 # ==============================
 # ===== CONFIG UI/UX ==========
@@ -86,6 +137,10 @@ PLAYER_NAME_MAPPING = {
     "DIALLO_MOUHAMED_MASSAYA": ("DIALLO, MOUHAMED MASSAYA", 15),
 }
 
+# Listas de jugadores compartidas entre sesiones (st.cache_resource)
+PLAYERS_CACHE_TTL_SECONDS = 300   # Reconstruir para recoger URLs de imagen revalidadas
+PLAYERS_CACHE_MAX_ENTRIES = 32    # Listas (equipo + imágenes + versión del Excel) en memoria
+
 # Datos de fallback en caso de error
 FALLBACK_PLAYERS = [
     {"number": 1,  "name": "Álvaro", "surnames": "ALMENARA SANABRIAS",  "slug": "ALMENARA_SANABRIAS_ALVARO"},
@@ -140,6 +195,24 @@ CSS = """
   overflow-y: auto;
 }
 
+/* percentiles de liga */
+.pct-badges {
+  display: flex;
+  flex-wrap: wrap;
+  gap: 6px;
+  margin: 4px 0 12px 0;
+}
+.pct-badge {
+  border-radius: 999px;
+  padding: 2px 10px;
+  font-size: 0.8rem;
+  font-weight: 600;
+  color: white;
+}
+.pct-high { background: #2e7d32; }
+.pct-mid { background: #757575; }
+.pct-low { background: #c62828; }
+
 /* breadcrumb estilo píldoras */
 .bc-line {
   display: flex;
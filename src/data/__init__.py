@@ -3,6 +3,8 @@
 Módulo de datos para la aplicación Scouting Hub
 """
 
+from .player import Player
+
 from .loader import (
     load_players_dynamically,
     get_team_players,
@@ -19,6 +21,9 @@ from .drive_loader import (
 )
 
 __all__ = [
+    # Registro de jugador compartido por cargadores y vistas
+    'Player',
+    
     # Funciones originales (solo local - mantenidas para compatibilidad)
     'load_players_dynamically',
     'get_team_players',
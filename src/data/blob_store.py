@@ -0,0 +1,136 @@
+# src/data/blob_store.py
+# -*- coding: utf-8 -*-
+"""
+Almacén de contenido de la cache de Drive (direccionado por md5)
+
+Cada archivo descargado se guarda una sola vez en DRIVE_BLOB_DIR con su
+md5Checksum de Drive como nombre. Los archivos de cada equipo son enlaces
+duros a ese contenido: el mismo PNG/PDF en otro equipo, en otra carpeta o con
+otro nombre (mayúsculas/minúsculas) no ocupa más disco ni se vuelve a descargar.
+Si el sistema de archivos no admite enlaces duros se copia el contenido (se
+ahorra la descarga, no el disco). Las referencias son explícitas: collect()
+elimina los blobs cuyo md5 no aparece en ningún manifest de equipo (st_nlink
+no sirve, porque un blob copiado también tiene un solo enlace).
+"""
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import AbstractSet, Optional
+
+from ..config import DRIVE_BLOB_DIR
+
+
+def _is_md5(value: Optional[str]) -> bool:
+    return bool(value) and len(value) == 32 and all(c in '0123456789abcdef' for c in value.lower())
+
+
+class BlobStore:
+    """Contenido de la cache de Drive, una copia por md5"""
+
+    def __init__(self, root: Path = DRIVE_BLOB_DIR):
+        self.root = Path(root)
+
+    def path_for(self, md5: str) -> Path:
+        """Ruta del blob de un md5 (dos niveles para no llenar una sola carpeta)"""
+        md5 = md5.lower()
+        return self.root / md5[:2] / md5
+
+    def has(self, md5: Optional[str]) -> bool:
+        """Indica si el contenido con ese md5 ya está en el almacén"""
+        return _is_md5(md5) and self.path_for(md5).exists()
+
+    @staticmethod
+    def _link_or_copy(source: Path, destination: Path):
+        """Enlace duro de source en destination (copia si no se puede enlazar), de forma atómica"""
+        tmp_path = destination.with_name(f".{destination.name}.link.tmp")
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, destination)
+
+    def materialize(self, md5: Optional[str], destination: Path) -> bool:
+        """
+        Crea destination a partir del blob, sin descargar nada
+
+        Args:
+            md5: md5Checksum de Drive del archivo
+            destination: Ruta local (en la carpeta del equipo)
+
+        Returns:
+            True si el contenido estaba en el almacén y ya está en destination
+        """
+        if not self.has(md5):
+            return False
+        try:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            self._link_or_copy(self.path_for(md5), destination)
+            return True
+        except OSError:
+            return False
+
+    def adopt(self, path: Path, md5: Optional[str]) -> bool:
+        """
+        Registra en el almacén un archivo recién descargado (ya verificado con su md5)
+
+        Returns:
+            True si el archivo queda respaldado por un blob
+        """
+        if not _is_md5(md5):
+            return False
+        blob_path = self.path_for(md5)
+        try:
+            if blob_path.exists():
+                # Ya había otra copia del mismo contenido: sustituir por un enlace al blob
+                if not os.path.samefile(blob_path, path):
+                    self._link_or_copy(blob_path, path)
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                self._link_or_copy(path, blob_path)
+            return True
+        except OSError:
+            return False
+
+    def collect(self, referenced: AbstractSet[str]) -> int:
+        """
+        Elimina los blobs que ya no usa ningún equipo (llamar con el lock de sincronización)
+
+        Args:
+            referenced: md5 (en minúsculas) registrados en los manifests de todos los equipos
+
+        Returns:
+            Bytes liberados
+        """
+        freed = 0
+        if not self.root.exists():
+            return 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                # Temporales de un enlace en curso (.md5.link.tmp)
+                if filename.startswith('.') or filename in referenced:
+                    continue
+                blob_path = os.path.join(dirpath, filename)
+                try:
+                    size = os.stat(blob_path).st_size
+                    os.unlink(blob_path)
+                    freed += size
+                except OSError:
+                    pass
+        return freed
+
+
+# Almacén global
+_blob_store = None
+_blob_store_lock = threading.Lock()
+
+def get_blob_store() -> BlobStore:
+    """Obtiene el almacén global de contenido de la cache de Drive"""
+    global _blob_store
+
+    with _blob_store_lock:
+        if _blob_store is None:
+            _blob_store = BlobStore()
+
+    return _blob_store
@@ -0,0 +1,200 @@
+# src/data/cache_index.py
+# -*- coding: utf-8 -*-
+"""
+Índice en memoria de la cache local de Drive
+
+Mantiene por carpeta un diccionario nombre -> (ruta, tamaño, mtime) para que
+las búsquedas de imágenes e informes no recorran el disco en cada llamada.
+Se construye una vez por carpeta y se mantiene al día con watchdog; sin
+watchdog (o si el observador no puede arrancar) se vuelve a escanear la carpeta
+cuando cambia su mtime.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+from ..config import DRIVE_CACHE_DIR
+
+
+class CachedAsset(NamedTuple):
+    """Archivo presente en la cache local"""
+    path: Path
+    size: int
+    mtime: float
+
+
+def _is_indexed(name: str) -> bool:
+    # Manifest, descargas parciales (.part), locks y temporales empiezan por '.'
+    return not name.startswith('.') and not name.endswith('.tmp')
+
+
+class _DirEntries:
+    """Archivos de una carpeta y vista {nombre: ruta} calculada bajo demanda"""
+
+    def __init__(self, assets: Dict[str, CachedAsset], dir_mtime_ns: int):
+        self.assets = assets
+        self.dir_mtime_ns = dir_mtime_ns
+        self.paths: Optional[Dict[str, Path]] = None
+
+
+class CacheDirIndex(FileSystemEventHandler):
+    """Índice de archivos en cache por carpeta, actualizado con eventos del sistema de archivos"""
+
+    def __init__(self, root: Path = DRIVE_CACHE_DIR):
+        super().__init__()
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._dirs: Dict[Path, _DirEntries] = {}
+        self._observer = None
+        self._watching = False
+
+    def _start_watching(self):
+        """Arranca el observador de watchdog sobre la raíz de la cache (una sola vez)"""
+        if self._observer is not None or not WATCHDOG_AVAILABLE:
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(self, str(self.root), recursive=True)
+            observer.start()
+            self._observer = observer
+            self._watching = True
+        except Exception:
+            # Sin observador (límites de inotify, sistemas de archivos remotos...): escaneo por mtime
+            self._observer = False
+            self._watching = False
+
+    @staticmethod
+    def _scan(directory: Path) -> _DirEntries:
+        assets = {}
+        try:
+            dir_mtime_ns = directory.stat().st_mtime_ns
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.is_file() or not _is_indexed(entry.name):
+                        continue
+                    stat = entry.stat()
+                    assets[entry.name] = CachedAsset(Path(entry.path), stat.st_size, stat.st_mtime)
+        except OSError:
+            dir_mtime_ns = -1
+        return _DirEntries(assets, dir_mtime_ns)
+
+    def _entries(self, directory: Path) -> _DirEntries:
+        """Entradas de una carpeta (escanea la primera vez o si no hay observador y cambió)"""
+        directory = Path(directory)
+        with self._lock:
+            self._start_watching()
+            entries = self._dirs.get(directory)
+
+            if entries is not None and not self._watching:
+                try:
+                    current_mtime = directory.stat().st_mtime_ns
+                except OSError:
+                    current_mtime = -1
+                if current_mtime != entries.dir_mtime_ns:
+                    entries = None
+
+            if entries is None:
+                entries = self._scan(directory)
+                self._dirs[directory] = entries
+            return entries
+
+    def lookup(self, directory: Path, name: str) -> Optional[CachedAsset]:
+        """Busca un archivo por nombre exacto dentro de una carpeta"""
+        return self._entries(directory).assets.get(name)
+
+    def files(self, directory: Path) -> Dict[str, Path]:
+        """
+        Archivos de una carpeta
+
+        Returns:
+            Diccionario {nombre: ruta} (compartido, no modificar)
+        """
+        entries = self._entries(directory)
+        with self._lock:
+            if entries.paths is None:
+                entries.paths = {name: asset.path for name, asset in entries.assets.items()}
+            return entries.paths
+
+    def count(self, directory: Path) -> int:
+        """Número de archivos de una carpeta"""
+        return len(self._entries(directory).assets)
+
+    def invalidate(self, directory: Optional[Path] = None):
+        """Fuerza un nuevo escaneo de una carpeta (o de todas)"""
+        with self._lock:
+            if directory is None:
+                self._dirs.clear()
+            else:
+                self._dirs.pop(Path(directory), None)
+
+    def refresh_file(self, path: Path):
+        """Actualiza la entrada de un archivo (creado, modificado o eliminado)"""
+        path = Path(path)
+        with self._lock:
+            entries = self._dirs.get(path.parent)
+            if entries is None:
+                return
+            try:
+                stat = path.stat()
+                entries.assets[path.name] = CachedAsset(path, stat.st_size, stat.st_mtime)
+            except OSError:
+                entries.assets.pop(path.name, None)
+            entries.paths = None
+
+    def forget(self, path: Path):
+        """Elimina un archivo o una carpeta completa del índice"""
+        path = Path(path)
+        with self._lock:
+            # Carpeta eliminada (rmtree): olvidar todas las carpetas bajo ella
+            for directory in [d for d in self._dirs if d == path or path in d.parents]:
+                del self._dirs[directory]
+            entries = self._dirs.get(path.parent)
+            if entries is not None and entries.assets.pop(path.name, None) is not None:
+                entries.paths = None
+
+    # ----- Eventos de watchdog -----
+
+    def on_created(self, event):
+        if not event.is_directory and _is_indexed(Path(event.src_path).name):
+            self.refresh_file(Path(event.src_path))
+
+    def on_modified(self, event):
+        if not event.is_directory and _is_indexed(Path(event.src_path).name):
+            self.refresh_file(Path(event.src_path))
+
+    def on_deleted(self, event):
+        self.forget(Path(event.src_path))
+
+    def on_moved(self, event):
+        self.forget(Path(event.src_path))
+        dest = Path(event.dest_path)
+        if event.is_directory:
+            self.invalidate(dest)
+        elif _is_indexed(dest.name):
+            self.refresh_file(dest)
+
+
+# Índice global de la cache de Drive
+_cache_index = None
+_cache_index_lock = threading.Lock()
+
+def get_cache_index() -> CacheDirIndex:
+    """Obtiene el índice global de la cache de Drive"""
+    global _cache_index
+
+    with _cache_index_lock:
+        if _cache_index is None:
+            _cache_index = CacheDirIndex()
+
+    return _cache_index
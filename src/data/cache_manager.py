@@ -0,0 +1,290 @@
+# src/data/cache_manager.py
+# -*- coding: utf-8 -*-
+"""
+Límite de tamaño de la cache local de Drive
+
+Cada equipo consultado crea su carpeta en DRIVE_CACHE_DIR (informe, imágenes y
+manifest). Este gestor registra cuándo se usó por última vez cada equipo y,
+cuando la cache supera DRIVE_CACHE_MAX_MB, elimina equipos completos empezando
+por el menos usado recientemente. Nunca elimina el equipo propio (TEAM_SLUG) ni
+el rival que alguna sesión tiene seleccionado (fijado durante DRIVE_CACHE_PIN_MINUTES
+desde su último uso, ya que Streamlit no avisa cuando una sesión se cierra).
+
+El tamaño se mide en disco real: cada archivo (st_dev, st_ino) cuenta una sola
+vez aunque esté enlazado desde varios equipos, y se incluye el almacén de
+contenido (DRIVE_BLOB_DIR). Solo se expulsan equipos cuya eliminación libera
+bytes (contenido que no comparte ningún otro equipo).
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from ..config import (
+    DRIVE_CACHE_DIR,
+    DRIVE_CACHE_MAX_MB,
+    DRIVE_CACHE_PIN_MINUTES,
+    TEAM_SLUG
+)
+from .cache_index import get_cache_index
+from .blob_store import get_blob_store
+from .sync_manifest import SyncManifest, MANIFEST_FILE
+
+
+_STATE_FILE = ".cache_state.json"
+
+# Guardar los accesos en disco como mucho cada tantos segundos
+_STATE_SAVE_INTERVAL = 60
+
+
+def _current_session_id() -> str:
+    """Identificador de la sesión de Streamlit actual (o del hilo, fuera de Streamlit)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            return ctx.session_id
+    except Exception:
+        pass
+    return threading.current_thread().name
+
+
+def _walk_files(directory: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """(nombre, stat) de los archivos de una carpeta (recursivo)"""
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            try:
+                yield filename, os.stat(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+
+
+class DriveCacheManager:
+    """Seguimiento de accesos por equipo y expulsión LRU con presupuesto en bytes"""
+
+    def __init__(self, root: Path = DRIVE_CACHE_DIR, max_bytes: int = DRIVE_CACHE_MAX_MB * 1024 * 1024,
+                 pin_seconds: float = DRIVE_CACHE_PIN_MINUTES * 60):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.pin_seconds = pin_seconds
+        self._lock = threading.Lock()
+        self._access: Dict[str, float] = {}
+        # sesión -> (equipo, hora del último uso)
+        self._pins: Dict[str, List[Any]] = {}
+        self._loaded = False
+        self._saved_at = 0.0
+
+    # ----- Estado persistente (compartido entre procesos) -----
+
+    def _load(self):
+        """Mezcla los accesos y fijaciones guardados por cualquier proceso con los de memoria"""
+        try:
+            with open(self.root / _STATE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for team_slug, accessed_at in data.get('access', {}).items():
+                self._access[team_slug] = max(self._access.get(team_slug, 0.0), float(accessed_at))
+            for owner, (team_slug, used_at) in data.get('pins', {}).items():
+                if owner not in self._pins or self._pins[owner][1] < used_at:
+                    self._pins[owner] = [team_slug, float(used_at)]
+        except (OSError, ValueError, TypeError, AttributeError):
+            pass
+        self._loaded = True
+
+    def _save(self):
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            state_path = self.root / _STATE_FILE
+            tmp_path = state_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'access': self._access, 'pins': self._pins}, f)
+            os.replace(tmp_path, state_path)
+            self._saved_at = time.time()
+        except OSError:
+            pass
+
+    # ----- Accesos y fijaciones -----
+
+    def touch(self, team_slug: str, pin: bool = False):
+        """
+        Registra un uso de la cache de un equipo
+
+        Args:
+            team_slug: Slug del equipo
+            pin: Es el rival seleccionado en la sesión actual (no se expulsa mientras se use)
+        """
+        now = time.time()
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._access[team_slug] = now
+            changed_pin = False
+            if pin:
+                owner = _current_session_id()
+                changed_pin = self._pins.get(owner, [None])[0] != team_slug
+                self._pins[owner] = [team_slug, now]
+            # Un rival recién fijado se guarda ya para que lo respeten los demás procesos
+            if changed_pin or now - self._saved_at >= _STATE_SAVE_INTERVAL:
+                self._save()
+
+    def pinned(self) -> set:
+        """Equipos que no se pueden expulsar"""
+        now = time.time()
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            for owner in [o for o, (_, used_at) in self._pins.items() if now - used_at > self.pin_seconds]:
+                del self._pins[owner]
+            return {TEAM_SLUG} | {team_slug for team_slug, _ in self._pins.values()}
+
+    # ----- Expulsión -----
+
+    def referenced_md5s(self) -> Dict[str, Set[str]]:
+        """md5 del contenido registrado en el manifest de cada equipo"""
+        references = {}
+        if not self.root.exists():
+            return references
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            if not os.path.exists(os.path.join(entry.path, MANIFEST_FILE)):
+                continue
+            manifest = SyncManifest(Path(entry.path))
+            references[entry.name] = {f['md5'].lower() for f in manifest.files.values() if f.get('md5')}
+        return references
+
+    def collect_blobs(self) -> int:
+        """Libera el contenido que ya no registra ningún manifest (llamar con el lock de sincronización)"""
+        referenced = set().union(*self.referenced_md5s().values())
+        return get_blob_store().collect(referenced)
+
+    def usage(self) -> Tuple[int, Dict[str, int]]:
+        """
+        Ocupación de la cache en disco
+
+        Returns:
+            (bytes totales contando cada archivo una vez, incluido el almacén de contenido;
+             {equipo: bytes que se liberarían al expulsarlo})
+        """
+        sizes: Dict[Tuple[int, int], int] = {}
+        owners: Dict[Tuple[int, int], Set[str]] = {}
+        teams: List[str] = []
+
+        if self.root.exists():
+            for entry in os.scandir(self.root):
+                if not entry.is_dir() or entry.name.startswith('.'):
+                    continue
+                teams.append(entry.name)
+                for _, stat in _walk_files(Path(entry.path)):
+                    key = (stat.st_dev, stat.st_ino)
+                    sizes[key] = stat.st_size
+                    owners.setdefault(key, set()).add(entry.name)
+
+        # Blobs: pertenecen a los equipos cuyo manifest registra su md5 (copias sin enlace incluidas)
+        teams_by_md5: Dict[str, Set[str]] = {}
+        for team_slug, md5s in self.referenced_md5s().items():
+            for md5 in md5s:
+                teams_by_md5.setdefault(md5, set()).add(team_slug)
+        for filename, stat in _walk_files(get_blob_store().root):
+            key = (stat.st_dev, stat.st_ino)
+            sizes[key] = stat.st_size
+            owners.setdefault(key, set()).update(teams_by_md5.get(filename, ()))
+
+        freeable = dict.fromkeys(teams, 0)
+        for key, key_owners in owners.items():
+            if len(key_owners) == 1:
+                freeable[next(iter(key_owners))] += sizes[key]
+        return sum(sizes.values()), freeable
+
+    def evict(self, team_slug: str, collect: bool = True) -> bool:
+        """
+        Elimina la cache completa de un equipo (llamar con el lock de sincronización)
+
+        Args:
+            team_slug: Slug del equipo
+            collect: Liberar también el contenido que ya no usa ningún otro equipo
+
+        Returns:
+            True si se eliminó algo
+        """
+        team_dir = self.root / team_slug
+        if not team_dir.exists():
+            return False
+        shutil.rmtree(team_dir, ignore_errors=True)
+        get_cache_index().forget(team_dir)
+        with self._lock:
+            self._access.pop(team_slug, None)
+        if collect:
+            self.collect_blobs()
+        return True
+
+    def enforce_budget(self) -> List[str]:
+        """
+        Expulsa equipos (menos usados primero) hasta que la cache cabe en el presupuesto.
+        Debe llamarse con el lock de sincronización entre procesos.
+
+        Returns:
+            Slugs de los equipos expulsados
+        """
+        # Contenido de archivos que ya no existen en Drive (prune) o de equipos eliminados
+        self.collect_blobs()
+
+        total, freeable = self.usage()
+        if total <= self.max_bytes:
+            return []
+
+        # Accesos y rivales fijados por los demás procesos
+        with self._lock:
+            self._load()
+            access = dict(self._access)
+        pinned = self.pinned()
+
+        def _last_used(team_slug: str) -> float:
+            if team_slug in access:
+                return access[team_slug]
+            # Equipos sin accesos registrados (cache anterior a este gestor): fecha de la carpeta
+            try:
+                return (self.root / team_slug).stat().st_mtime
+            except OSError:
+                return 0.0
+
+        evicted = []
+        while total > self.max_bytes:
+            # Un equipo cuyo contenido comparten otros no libera nada (hasta que se expulsan esos otros)
+            candidates = [t for t, size in freeable.items()
+                          if size > 0 and t not in pinned and t not in evicted]
+            if not candidates:
+                break
+            team_slug = min(candidates, key=_last_used)
+            self.evict(team_slug)
+            evicted.append(team_slug)
+            total, freeable = self.usage()
+
+        with self._lock:
+            self._save()
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Tamaño actual, presupuesto y equipos fijados"""
+        return {
+            'bytes': self.usage()[0],
+            'max_bytes': self.max_bytes,
+            'pinned': sorted(self.pinned())
+        }
+
+
+# Gestor global de la cache de Drive
+_cache_manager = None
+_cache_manager_lock = threading.Lock()
+
+def get_cache_manager() -> DriveCacheManager:
+    """Obtiene el gestor global de la cache de Drive"""
+    global _cache_manager
+
+    with _cache_manager_lock:
+        if _cache_manager is None:
+            _cache_manager = DriveCacheManager()
+
+    return _cache_manager
@@ -0,0 +1,171 @@
+# src/data/derived_stats.py
+# -*- coding: utf-8 -*-
+"""
+Estadísticas derivadas del Excel de jugadores
+
+Calcula de una vez, con operaciones vectorizadas sobre columnas, las medias por
+partido, los valores por 36 minutos y los porcentajes de tiro (eFG%, TS%),
+uso de posesiones y asistencias/pérdidas de todas las filas del Excel. El
+resultado se guarda como artefacto derivado del snapshot, de modo que las
+vistas solo leen columnas ya calculadas.
+"""
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from .snapshot import get_roster_snapshot
+
+
+# Columnas del Excel usadas como totales de temporada
+_TOTAL_COLUMNS = {
+    'games': 'PJ',
+    'minutes': 'MINUTOS JUGADOS',
+    'points': 'PUNTOS',
+    'fg2m': 'T2 CONVERTIDO',
+    'fg2a': 'T2 INTENTADO',
+    'fg3m': 'T3 CONVERTIDO',
+    'fg3a': 'T3 INTENTADO',
+    'ftm': 'TL CONVERTIDOS',
+    'fta': 'TL INTENTADOS',
+    'oreb': 'REB OFFENSIVO',
+    'dreb': 'REB DEFENSIVO',
+    'assists': 'ASISTENCIAS',
+    'steals': 'RECUPEROS',
+    'turnovers': 'PERDIDAS',
+    'fouls': 'FaltasCOMETIDAS',
+    'fouls_drawn': 'FaltasRECIBIDAS',
+}
+
+# Peso de los tiros libres en las posesiones usadas (convención habitual)
+_FTA_WEIGHT = 0.44
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Cociente elemento a elemento; NaN donde el denominador es 0"""
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def compute_derived_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula las estadísticas derivadas de todas las filas del Excel
+
+    Args:
+        df: DataFrame del Excel de jugadores
+
+    Returns:
+        DataFrame con el mismo índice que df (id de fila) y una columna por estadística.
+        Los porcentajes van de 0 a 1; los valores sin denominador (0 minutos, 0 tiros) son NaN
+    """
+    totals = {
+        key: pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        if column in df.columns else np.zeros(len(df))
+        for key, column in _TOTAL_COLUMNS.items()
+    }
+    games = totals['games']
+    minutes = totals['minutes']
+
+    rebounds = totals['oreb'] + totals['dreb']
+    fga = totals['fg2a'] + totals['fg3a']
+    fgm = totals['fg2m'] + totals['fg3m']
+    possessions = fga + _FTA_WEIGHT * totals['fta'] + totals['turnovers']
+
+    stats = {
+        'points': totals['points'],
+        'minutes': minutes,
+        'games_played': games,
+        'rebounds': rebounds,
+
+        # Por partido
+        'ppg': _ratio(totals['points'], games),
+        'mpg': _ratio(minutes, games),
+        'rpg': _ratio(rebounds, games),
+        'apg': _ratio(totals['assists'], games),
+        'spg': _ratio(totals['steals'], games),
+        'topg': _ratio(totals['turnovers'], games),
+
+        # Por 36 minutos
+        'pts_per36': _ratio(totals['points'] * 36, minutes),
+        'reb_per36': _ratio(rebounds * 36, minutes),
+        'ast_per36': _ratio(totals['assists'] * 36, minutes),
+        'stl_per36': _ratio(totals['steals'] * 36, minutes),
+        'tov_per36': _ratio(totals['turnovers'] * 36, minutes),
+
+        # Tiro
+        'fg2_pct': _ratio(totals['fg2m'], totals['fg2a']),
+        'fg3_pct': _ratio(totals['fg3m'], totals['fg3a']),
+        'ft_pct': _ratio(totals['ftm'], totals['fta']),
+        'efg_pct': _ratio(fgm + 0.5 * totals['fg3m'], fga),
+        'ts_pct': _ratio(totals['points'], 2 * (fga + _FTA_WEIGHT * totals['fta'])),
+        'fg3_rate': _ratio(totals['fg3a'], fga),
+        'ft_rate': _ratio(totals['fta'], fga),
+
+        # Uso y creación
+        'usage_per36': _ratio(possessions * 36, minutes),
+        'ast_to': _ratio(totals['assists'], totals['turnovers']),
+    }
+    result = pd.DataFrame(stats, index=df.index)
+
+    # Uso respecto al equipo: posesiones usadas por minuto en pista frente a las del equipo
+    if 'EQUIPO' in df.columns:
+        groups = [df['EQUIPO']] + ([df['FASE']] if 'FASE' in df.columns else [])
+        frame = pd.DataFrame({'minutes': minutes, 'possessions': possessions}, index=df.index)
+        team_totals = frame.groupby(groups, sort=False, dropna=False, observed=True).transform('sum')
+        team_rate = _ratio(team_totals['possessions'].to_numpy(), team_totals['minutes'].to_numpy() / 5)
+        result['usage_pct'] = _ratio(result['usage_per36'].to_numpy() / 36, team_rate)
+    else:
+        result['usage_pct'] = np.nan
+
+    return result
+
+
+class DerivedStats:
+    """Estadísticas derivadas de un snapshot, con acceso por id de fila"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.frame = compute_derived_stats(df)
+        self._records: Optional[Dict[Any, Mapping[str, float]]] = None
+
+    def row(self, row_id: Any) -> Mapping[str, float]:
+        """
+        Estadísticas de una fila del Excel
+
+        Returns:
+            Vista de solo lectura {estadística: valor} (NaN si no se puede calcular),
+            vacía si la fila no existe. Se comparte entre todos los jugadores cacheados
+        """
+        if self._records is None:
+            self._records = {
+                key: MappingProxyType({column: float(value) for column, value in values.items()})
+                for key, values in self.frame.to_dict('index').items()
+            }
+        return self._records.get(row_id, MappingProxyType({}))
+
+
+def get_derived_stats() -> DerivedStats:
+    """Obtiene las estadísticas derivadas del snapshot actual del Excel"""
+    return get_roster_snapshot().derived('derived_stats', DerivedStats)
+
+
+def player_stats(row_id: Any) -> Dict[str, Any]:
+    """
+    Campos de estadísticas de un jugador (argumentos de Player)
+
+    Args:
+        row_id: Id de fila del Excel
+
+    Returns:
+        points/minutes/games_played (como antes), 'stats' con todas las derivadas
+        y 'row_id' para consultar otras tablas precalculadas (percentiles)
+    """
+    stats = get_derived_stats().row(row_id)
+    return {
+        'row_id': row_id,
+        'points': int(stats.get('points', 0)),
+        'minutes': float(stats.get('minutes', 0.0)),
+        'games_played': int(stats.get('games_played', 0)),
+        'stats': stats,
+    }
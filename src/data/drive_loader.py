@@ -4,86 +4,79 @@
 Cargador principal de datos desde Google Drive
 """
 import os
+import json
+import threading
 import time
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterable, Optional, Any, Tuple
 import streamlit as st
 
 from ..utils.google_drive import get_drive_client
+from ..utils.drive_governor import DriveRequestError
+from ..utils.image_probe import get_image_probe
+from ..utils.file_lock import FileLock
+from ..utils.single_flight import SingleFlight
+from .snapshot import load_roster, get_roster_snapshot
+from .name_index import get_name_index
+from .derived_stats import player_stats
+from .schema import row_text
+from .player import Player
+from .sync_manifest import SyncManifest, MANIFEST_FILE
+from .cache_index import get_cache_index
+from .cache_manager import get_cache_manager
+from .blob_store import get_blob_store
 from ..config import (
     GOOGLE_DRIVE_ROOT_FOLDER_ID, 
     DRIVE_CACHE_DIR, 
     CACHE_EXPIRY_HOURS,
+    DRIVE_SYNC_RETRY_SECONDS,
+    DRIVE_SYNC_LOCK_TIMEOUT,
+    DRIVE_MISSING_FILE_TTL_MINUTES,
+    DRIVE_REFRESH_INTERVAL_MINUTES,
     TEAM_SLUG,
     TEAM_NAME_DISPLAY,
-    EXCEL_FILE
+    EXCEL_FILE,
+    DRIVE_DOWNLOAD_WORKERS,
+    PLAYERS_CACHE_TTL_SECONDS,
+    PLAYERS_CACHE_MAX_ENTRIES
 )
 
 
-import requests  # <-- arriba (si no estaba)
-
-@st.cache_data(show_spinner=False, ttl=3600)
-def _probe_image_url(url: str) -> bool:
-    try:
-        if not url or not isinstance(url, str):
-            return False
-        url = url.strip()
-        if not url.startswith("http"):
-            return False
-
-        headers = {
-            "Range": "bytes=0-1023",
-            "User-Agent": "Mozilla/5.0 Streamlit/1.0",
-            "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-        }
-        r = requests.get(url, headers=headers, timeout=4, stream=True)
-        if r.status_code not in (200, 206):
-            return False
-
-        ctype = r.headers.get("Content-Type", "").lower()
-        if not ctype.startswith("image/"):
-            return False
-
-        chunk = next(r.iter_content(1024), b"")
-        if not chunk:
-            return False
-
-        is_png = chunk.startswith(b"\x89PNG\r\n\x1a\n")
-        is_jpg = chunk.startswith(b"\xff\xd8\xff")
-        is_webp = chunk[:4] == b"RIFF" and b"WEBP" in chunk[:12]
-        return bool(is_png or is_jpg or is_webp)
-    except Exception:
-        return False
-
 
 def _safe_image_url(url: str) -> str:
     """Devuelve la URL si es imagen real, si no devuelve ''."""
-    return url if _probe_image_url(url) else ""
+    return url if get_image_probe().probe(url) else ""
+
+
+_FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+_CHANGES_STATE_FILE = ".changes_state.json"
+_SYNC_LOCK_FILE = ".sync.lock"
+
+# Descargas en curso por recurso de Drive, compartidas entre sesiones del proceso
+_drive_flights = SingleFlight()
 
 
 class DriveDataLoader:
     """Cargador de datos desde Google Drive con cache local"""
     
-    def __init__(self):
+    def __init__(self, changes_source=None):
         self.drive_client = get_drive_client()
         self.cache_dir = DRIVE_CACHE_DIR
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Origen del feed de cambios (por defecto el propio cliente de Drive;
+        # LocalChangesFeed permite probar la sincronización incremental sin conexión)
+        self.changes_source = changes_source
+        
         # Cache de IDs de carpetas para evitar búsquedas repetidas
         self._folder_cache = {}
-    
-    def is_cache_valid(self, file_path: Path) -> bool:
-        """Verifica si el archivo en cache es válido (no expirado)"""
-        if not file_path.exists():
-            return False
         
-        # Verificar tiempo de modificación
-        file_time = file_path.stat().st_mtime
-        current_time = time.time()
-        age_hours = (current_time - file_time) / 3600
+        # Imágenes confirmadas como inexistentes en Drive: nombre -> hora de la comprobación
+        self._missing_images: Dict[str, float] = {}
         
-        return age_hours < CACHE_EXPIRY_HOURS
+        # Lock entre procesos para sincronizaciones y limpiezas de la cache
+        self.sync_lock = FileLock(self.cache_dir / _SYNC_LOCK_FILE)
     
     def get_team_folder_id(self, team_name: str = None) -> Optional[str]:
         """
@@ -132,7 +125,7 @@ class DriveDataLoader:
             return self._folder_cache[cache_key]
         
         # Buscar carpeta de jugadores
-        folders = self.drive_client.list_folders_in_folder(team_folder_id)
+        folders = self.drive_client.catalog_folders(team_folder_id)
         
         for folder in folders:
             if folder['name'].lower() == 'jugadores':
@@ -141,12 +134,128 @@ class DriveDataLoader:
         
         return None
     
+    def get_manifest(self, team_slug: str = None) -> SyncManifest:
+        """Obtiene el manifest de sincronización de un equipo"""
+        return SyncManifest(self.cache_dir / (team_slug or TEAM_SLUG))
+    
+    def sync_files(self, manifest: SyncManifest, scope: str, folder_id: str,
+                   files: Iterable[Dict[str, Any]], target_dir: Path,
+                   lowercase: bool = False, local_name: Optional[str] = None,
+                   max_workers: int = DRIVE_DOWNLOAD_WORKERS, complete: bool = True,
+                   report: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Path]:
+        """
+        Sincroniza un listado de Drive con la cache local usando el manifest:
+        solo descarga archivos nuevos o cuyo md5/modifiedTime ha cambiado
+        
+        Args:
+            manifest: Manifest del equipo
+            scope: Carpeta lógica dentro del equipo ('informe', 'jugadores')
+            folder_id: ID de la carpeta listada
+            files: Archivos listados en Drive (puede ser un generador: las descargas
+                   empiezan mientras llegan las siguientes páginas del listado)
+            target_dir: Carpeta local de destino
+            lowercase: Guardar los archivos con el nombre en minúsculas
+            local_name: Nombre local fijo (carpetas con un único archivo, como el informe)
+            max_workers: Descargas simultáneas (1 = secuencial)
+            complete: El listado es la carpeta completa (False para descargas sueltas:
+                      no se olvidan otros archivos ni se marca la carpeta como sincronizada)
+            report: Lista donde añadir los tiempos por archivo de las descargas de esta llamada
+        
+        Returns:
+            Diccionario con {nombre_archivo: path_local}
+        
+        Raises:
+            DriveRequestError: Si el listado falla a mitad (lo ya descargado queda registrado)
+        """
+        # Blobs, manifest y expulsión bajo el mismo lock que collect_blobs: un blob recién
+        # adoptado no está en ningún manifest guardado hasta manifest.save() (reentrante:
+        # los llamantes normalmente ya lo tienen)
+        with self.sync_lock:
+            return self._sync_files(manifest, scope, folder_id, files, target_dir, lowercase,
+                                    local_name, max_workers, complete, report)
+    
+    def _sync_files(self, manifest: SyncManifest, scope: str, folder_id: str,
+                    files: Iterable[Dict[str, Any]], target_dir: Path, lowercase: bool,
+                    local_name: Optional[str], max_workers: int, complete: bool,
+                    report: Optional[List[Dict[str, Any]]]) -> Dict[str, Path]:
+        """Cuerpo de sync_files (con el lock de sincronización)"""
+        target_dir.mkdir(parents=True, exist_ok=True)
+        manifest.configure_scope(scope, folder_id, target_dir, lowercase=lowercase, local_name=local_name)
+        # Un listado servido desde un catálogo caducado no basta para olvidar archivos
+        # ni para dar la carpeta por sincronizada (se hará al revalidarse el catálogo)
+        if complete and not self.drive_client.catalog_is_fresh(folder_id):
+            complete = False
+        synced = {}
+        pending = []
+        listed_ids = []
+        listing_errors = []
+        cache_index = get_cache_index()
+        blob_store = get_blob_store()
+        
+        def _pending_downloads():
+            try:
+                for drive_file in files:
+                    listed_ids.append(drive_file['id'])
+                    local_path = manifest.local_path_for(scope, drive_file['name'])
+                    
+                    if manifest.is_current(drive_file, local_path):
+                        synced[local_path.name] = local_path
+                    elif blob_store.materialize(drive_file.get('md5Checksum'), local_path):
+                        # Mismo contenido ya descargado (otro equipo, otra carpeta u otro nombre)
+                        stale_path = manifest.record(scope, drive_file, local_path)
+                        if stale_path:
+                            cache_index.forget(stale_path)
+                        cache_index.refresh_file(local_path)
+                        synced[local_path.name] = local_path
+                    else:
+                        pending.append((drive_file, local_path))
+                        yield drive_file['id'], local_path, drive_file.get('md5Checksum')
+            except DriveRequestError as e:
+                # Listado a medias: registrar lo descargado y no tratarlo como la carpeta completa
+                listing_errors.append(e)
+        
+        # Descargar solo lo nuevo o modificado, en paralelo y según llega el listado
+        downloads = _pending_downloads()
+        # Informe local a esta llamada: el cargador lo comparten todos los hilos
+        download_report = self.drive_client.download_files(downloads, max_workers)
+        if report is not None:
+            report.extend(download_report)
+        for _ in downloads:
+            pass  # Terminar de recorrer el listado si no se descargó nada (Drive no disponible)
+        
+        for (drive_file, _), item in zip(pending, download_report):
+            if item['success']:
+                blob_store.adopt(item['path'], drive_file.get('md5Checksum'))
+                stale_path = manifest.record(scope, drive_file, item['path'])
+                if stale_path:
+                    cache_index.forget(stale_path)
+                cache_index.refresh_file(item['path'])
+                synced[item['path'].name] = item['path']
+            # Else: fallar silenciosamente
+        
+        # Olvidar archivos que ya no están en Drive (un listado vacío puede ser un error de red)
+        if complete and not listing_errors:
+            if listed_ids:
+                manifest.prune(scope, listed_ids)
+            manifest.mark_synced(scope)
+        manifest.save()
+        
+        # Lo descargado puede haber pasado el presupuesto de la cache: expulsar equipos antiguos
+        cache_manager = get_cache_manager()
+        cache_manager.touch(manifest.team_dir.name)
+        if any(item['success'] for item in download_report):
+            cache_manager.enforce_budget()
+        
+        if listing_errors:
+            raise listing_errors[0]
+        return synced
+    
     def download_team_report(self, force_refresh: bool = False) -> Optional[Path]:
         """
         Descarga el informe del equipo desde Google Drive
         
         Args:
-            force_refresh: Forzar descarga aunque exista en cache
+            force_refresh: Comprobar cambios en Drive aunque la cache no haya caducado
         
         Returns:
             Path al archivo local del informe o None si falla
@@ -157,9 +266,10 @@ class DriveDataLoader:
         
         # Ruta del archivo en cache
         cached_file = team_cache_dir / f"{TEAM_SLUG}.pdf"
+        manifest = self.get_manifest(TEAM_SLUG)
         
         # Verificar si usar cache
-        if not force_refresh and self.is_cache_valid(cached_file):
+        if not force_refresh and manifest.is_fresh('informe') and cached_file.exists():
             return cached_file
         
         # Descargar desde Google Drive
@@ -171,7 +281,7 @@ class DriveDataLoader:
             return None
         
         # Buscar archivo PDF del equipo
-        files = self.drive_client.list_files_in_folder(team_folder_id, 'pdf')
+        files = self.drive_client.catalog_files(team_folder_id, 'pdf')
         
         team_pdf = None
         for file in files:
@@ -182,18 +292,21 @@ class DriveDataLoader:
         if not team_pdf:
             return None
         
-        # Descargar archivo
-        if self.drive_client.download_file(team_pdf['id'], cached_file):
-            return cached_file
-        else:
-            return None
+        # Descargar archivo solo si cambió
+        synced = self.sync_files(manifest, 'informe', team_folder_id, [team_pdf], team_cache_dir,
+                                 local_name=cached_file.name)
+        return synced.get(cached_file.name)
     
-    def download_player_images(self, force_refresh: bool = False) -> Dict[str, Path]:
+    def download_player_images(self, force_refresh: bool = False,
+                               max_workers: int = DRIVE_DOWNLOAD_WORKERS,
+                               report: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Path]:
         """
         Descarga todas las imágenes de jugadores desde Google Drive
         
         Args:
-            force_refresh: Forzar descarga aunque existan en cache
+            force_refresh: Comprobar cambios en Drive aunque la cache no haya caducado
+            max_workers: Descargas simultáneas (1 = secuencial)
+            report: Lista donde añadir los tiempos por archivo de las descargas
         
         Returns:
             Diccionario con {nombre_archivo: path_local}
@@ -201,6 +314,13 @@ class DriveDataLoader:
         # Crear carpeta de cache para jugadores
         players_cache_dir = self.cache_dir / TEAM_SLUG / "jugadores"
         players_cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.get_manifest(TEAM_SLUG)
+        
+        # Verificar si usar cache
+        if not force_refresh and manifest.is_fresh('jugadores'):
+            cached_images = manifest.local_files('jugadores')
+            if cached_images:
+                return cached_images
         
         downloaded_images = {}
         
@@ -217,25 +337,59 @@ class DriveDataLoader:
             return downloaded_images
         
         # Listar imágenes en la carpeta de jugadores
-        images = self.drive_client.list_files_in_folder(players_folder_id, 'png')
+        images = self.drive_client.catalog_iter_files(players_folder_id, 'png')
+        self._missing_images.clear()
         
-        for image in images:
-            original_name = image['name']
-            # Normalizar nombre del archivo a minúsculas para consistencia
-            normalized_name = original_name.lower()
-            cached_image = players_cache_dir / normalized_name
-            
-            # Verificar si usar cache
-            if not force_refresh and self.is_cache_valid(cached_image):
-                downloaded_images[normalized_name] = cached_image
-                continue
-            
-            # Descargar imagen con nombre normalizado
-            if self.drive_client.download_file(image['id'], cached_image):
-                downloaded_images[normalized_name] = cached_image
-            # Else: fallar silenciosamente
+        # Normalizar nombre del archivo a minúsculas para consistencia
+        return self.sync_files(manifest, 'jugadores', players_folder_id, images, players_cache_dir,
+                               lowercase=True, max_workers=max_workers, report=report)
+    
+    def _player_images_listing(self, players_folder_id: str) -> Dict[str, Dict[str, Any]]:
+        """Imágenes de la carpeta de jugadores por nombre en minúsculas (desde el catálogo)"""
+        images = self.drive_client.catalog_files(players_folder_id, 'png')
+        return {f['name'].lower(): f for f in images}
+    
+    def is_known_missing(self, image_name: str) -> bool:
+        """Indica si la imagen se buscó en Drive hace menos de DRIVE_MISSING_FILE_TTL_MINUTES y no existía"""
+        checked_at = self._missing_images.get(image_name.lower())
+        return bool(checked_at) and time.time() - checked_at < DRIVE_MISSING_FILE_TTL_MINUTES * 60
+    
+    def fetch_player_image(self, image_name: str) -> Optional[Path]:
+        """
+        Descarga una sola imagen de jugador resolviendo su ID en el listado en cache.
+        Las imágenes que no existen en Drive se recuerdan durante DRIVE_MISSING_FILE_TTL_MINUTES.
+        
+        Args:
+            image_name: Nombre del archivo de imagen (ej: "jugador_1.png")
         
-        return downloaded_images
+        Returns:
+            Path local de la imagen o None si no existe en Drive
+        """
+        normalized_name = image_name.lower()
+        
+        if self.is_known_missing(normalized_name):
+            return None
+        
+        if not self.drive_client:
+            return None
+        
+        team_folder_id = self.get_team_folder_id()
+        if not team_folder_id:
+            return None
+        
+        players_folder_id = self.get_players_folder_id(team_folder_id)
+        if not players_folder_id:
+            return None
+        
+        drive_file = self._player_images_listing(players_folder_id).get(normalized_name)
+        if drive_file is None:
+            self._missing_images[normalized_name] = time.time()
+            return None
+        
+        players_cache_dir = self.cache_dir / TEAM_SLUG / "jugadores"
+        synced = self.sync_files(self.get_manifest(TEAM_SLUG), 'jugadores', players_folder_id,
+                                 [drive_file], players_cache_dir, lowercase=True, complete=False)
+        return synced.get(normalized_name)
     
     def sync_team_data(self, force_refresh: bool = False) -> Dict[str, Any]:
         """
@@ -250,17 +404,22 @@ class DriveDataLoader:
         result = {
             'team_report': None,
             'player_images': {},
+            'download_timings': [],
             'success': False,
             'errors': []
         }
         
         try:
+            # Una sincronización forzada vuelve a recorrer el árbol de Drive (lotes por nivel)
+            if force_refresh and self.drive_client:
+                self.drive_client.get_catalog(max_age_seconds=0)
+            
             # Descargar informe del equipo
             team_report = self.download_team_report(force_refresh)
             result['team_report'] = team_report
             
             # Descargar imágenes de jugadores
-            player_images = self.download_player_images(force_refresh)
+            player_images = self.download_player_images(force_refresh, report=result['download_timings'])
             result['player_images'] = player_images
             
             result['success'] = bool(team_report or player_images)
@@ -272,23 +431,212 @@ class DriveDataLoader:
         
         return result
     
+    def _load_changes_state(self) -> Dict[str, Any]:
+        """Lee el estado del feed de cambios (token de página)"""
+        try:
+            with open(self.cache_dir / _CHANGES_STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_changes_state(self, state: Dict[str, Any]):
+        """Guarda el estado del feed de cambios de forma atómica"""
+        state_path = self.cache_dir / _CHANGES_STATE_FILE
+        tmp_path = state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+    
+    def _cached_manifests(self) -> List[SyncManifest]:
+        """Manifests de todos los equipos presentes en la cache"""
+        if not self.cache_dir.exists():
+            return []
+        return [SyncManifest(team_dir) for team_dir in self.cache_dir.iterdir()
+                if (team_dir / MANIFEST_FILE).exists()]
+    
+    def sync_changes(self) -> Dict[str, Any]:
+        """
+        Sincronización incremental mediante el feed de cambios de Drive (Changes API).
+        
+        La primera vez guarda el token inicial y hace una sincronización completa.
+        Las siguientes solo leen los cambios desde ese token y actualizan las entradas
+        de cache afectadas (archivos nuevos, modificados o eliminados en carpetas
+        conocidas bajo GOOGLE_DRIVE_ROOT_FOLDER_ID), sin listar carpetas.
+        
+        Returns:
+            Diccionario con success, full_sync, updated, removed y errors
+        """
+        # Escribe blobs y manifests: mismo lock que collect_blobs (reentrante)
+        with self.sync_lock:
+            return self._sync_changes()
+    
+    def _sync_changes(self) -> Dict[str, Any]:
+        """Cuerpo de sync_changes (con el lock de sincronización)"""
+        result = {
+            'success': False,
+            'full_sync': False,
+            'updated': [],
+            'removed': [],
+            'errors': []
+        }
+        
+        source = self.changes_source or self.drive_client
+        if not source:
+            result['errors'].append('Google Drive no está disponible')
+            return result
+        
+        state = self._load_changes_state()
+        page_token = state.get('page_token')
+        
+        if not page_token:
+            # Guardar el token ANTES de la sincronización completa para no perder cambios
+            page_token = source.get_start_page_token()
+            sync_result = self.sync_team_data(force_refresh=True)
+            result['full_sync'] = True
+            result['errors'].extend(sync_result['errors'])
+            if page_token and sync_result['success']:
+                self._save_changes_state({'page_token': page_token})
+                result['success'] = True
+            return result
+        
+        changes, new_token = source.list_changes(page_token)
+        if new_token is None:
+            result['errors'].append('No se pudo leer el feed de cambios de Google Drive')
+            return result
+        
+        # Indexar lo que hay en cache: archivo -> manifest, carpeta -> (manifest, scope)
+        manifests = self._cached_manifests()
+        manifest_by_file = {}
+        scope_by_folder = {}
+        for manifest in manifests:
+            for file_id in manifest.files:
+                manifest_by_file[file_id] = manifest
+            for scope, info in manifest.scopes.items():
+                if info.get('folder_id'):
+                    scope_by_folder[info['folder_id']] = (manifest, scope)
+        
+        watched_folders = set(scope_by_folder) | set(self._folder_cache.values()) | {GOOGLE_DRIVE_ROOT_FOLDER_ID}
+        pending = []
+        cache_index = get_cache_index()
+        blob_store = get_blob_store()
+        
+        for change in changes:
+            file_id = change.get('fileId')
+            drive_file = change.get('file') or {}
+            parents = set(drive_file.get('parents') or [])
+            gone = change.get('removed') or drive_file.get('trashed', False)
+            
+            # Carpetas creadas, movidas o renombradas bajo la raíz: invalidar IDs en memoria
+            if drive_file.get('mimeType') == _FOLDER_MIME_TYPE or file_id in watched_folders:
+                if file_id in watched_folders or parents & watched_folders:
+                    self._folder_cache.clear()
+                    if self.drive_client:
+                        self.drive_client.invalidate_catalog()
+                continue
+            
+            manifest = manifest_by_file.get(file_id)
+            if manifest is not None:
+                entry = manifest.files[file_id]
+                scope = entry['scope']
+                folder_id = manifest.scopes.get(scope, {}).get('folder_id')
+                
+                # Eliminado o movido fuera de su carpeta: quitar de la cache
+                if gone or (parents and folder_id not in parents):
+                    cache_index.forget(manifest.forget(file_id))
+                    result['removed'].append(file_id)
+                    continue
+                
+                local_path = manifest.local_path_for(scope, drive_file.get('name', entry['name']))
+                if not manifest.is_current(drive_file, local_path):
+                    if manifest.path_of(file_id) != local_path:
+                        # Renombrado: borrar la copia con el nombre anterior
+                        cache_index.forget(manifest.forget(file_id))
+                    pending.append((manifest, scope, drive_file, local_path))
+                continue
+            
+            if gone:
+                continue
+            
+            # Archivo nuevo dentro de una carpeta de jugadores conocida
+            for parent in parents:
+                if parent not in scope_by_folder:
+                    continue
+                manifest, scope = scope_by_folder[parent]
+                if manifest.scopes[scope].get('local_name'):
+                    break  # Carpetas de un único archivo (informe): lo decide la sincronización completa
+                if drive_file.get('mimeType') in ('image/png', 'image/jpeg'):
+                    pending.append((manifest, scope, drive_file, manifest.local_path_for(scope, drive_file['name'])))
+                break
+        
+        # Contenido ya descargado (otro equipo, otra carpeta u otro nombre): enlazar sin descargar
+        to_download = []
+        for manifest, scope, drive_file, local_path in pending:
+            if blob_store.materialize(drive_file.get('md5Checksum'), local_path):
+                manifest.record(scope, drive_file, local_path)
+                cache_index.refresh_file(local_path)
+                result['updated'].append(drive_file['id'])
+            else:
+                to_download.append((manifest, scope, drive_file, local_path))
+        pending = to_download
+        
+        # Descargar en paralelo solo los archivos afectados
+        if pending and not self.drive_client:
+            result['errors'].append('Google Drive no está disponible para descargar cambios')
+            return result
+        
+        report = self.drive_client.download_files(
+            [(drive_file['id'], local_path, drive_file.get('md5Checksum')) for _, _, drive_file, local_path in pending]
+        ) if pending else []
+        
+        for (manifest, scope, drive_file, _), item in zip(pending, report):
+            if item['success']:
+                blob_store.adopt(item['path'], drive_file.get('md5Checksum'))
+                manifest.record(scope, drive_file, item['path'])
+                cache_index.refresh_file(item['path'])
+                result['updated'].append(drive_file['id'])
+            else:
+                result['errors'].append(f"No se pudo descargar {drive_file.get('name', drive_file['id'])}")
+        
+        if result['errors']:
+            # Conservar el token para reintentar los mismos cambios en la próxima sincronización
+            for manifest in manifests:
+                manifest.save()
+            return result
+        
+        # Con el feed aplicado, todas las carpetas en cache están al día
+        for manifest in manifests:
+            for scope in manifest.scopes:
+                manifest.mark_synced(scope)
+            manifest.save()
+        
+        # El catálogo en memoria ya no refleja los archivos cambiados
+        if changes and self.drive_client:
+            self.drive_client.invalidate_catalog()
+        
+        self._save_changes_state({'page_token': new_token})
+        result['success'] = True
+        return result
+    
     def get_cached_team_report(self) -> Optional[Path]:
         """Obtiene el informe del equipo desde cache (sin descargar)"""
-        cached_file = self.cache_dir / TEAM_SLUG / f"{TEAM_SLUG}.pdf"
-        return cached_file if cached_file.exists() else None
+        asset = get_cache_index().lookup(self.cache_dir / TEAM_SLUG, f"{TEAM_SLUG}.pdf")
+        return asset.path if asset else None
+    
+    def get_cached_player_image(self, image_name: str) -> Optional[Path]:
+        """Busca una imagen de jugador en cache por nombre (sin descargar ni recorrer la carpeta)"""
+        asset = get_cache_index().lookup(self.cache_dir / TEAM_SLUG / "jugadores", image_name.lower())
+        return asset.path if asset else None
     
     def get_cached_player_images(self) -> Dict[str, Path]:
         """Obtiene las imágenes de jugadores desde cache (sin descargar)"""
         players_cache_dir = self.cache_dir / TEAM_SLUG / "jugadores"
         
-        if not players_cache_dir.exists():
-            return {}
-        
         images = {}
         needs_cleanup = False
         
-        for file_path in players_cache_dir.glob("*.png"):
-            filename = file_path.name
+        for filename, file_path in get_cache_index().files(players_cache_dir).items():
+            if not filename.endswith('.png'):
+                continue
             # Verificar si hay archivos con nombres en mayúsculas (cache obsoleto)
             if filename != filename.lower():
                 needs_cleanup = True
@@ -296,27 +644,33 @@ class DriveDataLoader:
             else:
                 images[filename] = file_path
         
-        # Si detectamos archivos obsoletos, limpiar cache
-        if needs_cleanup:
+        # Si detectamos archivos obsoletos, limpiar cache (salvo que otro proceso
+        # esté sincronizando: entonces se sirven las imágenes válidas actuales)
+        if needs_cleanup and self.sync_lock.acquire(blocking=False):
             st.info("🧹 Limpiando cache obsoleto...")
             try:
                 import shutil
                 shutil.rmtree(players_cache_dir)
+                get_cache_index().forget(players_cache_dir)
                 players_cache_dir.mkdir(parents=True, exist_ok=True)
                 return {}  # Forzar descarga
             except Exception as e:
                 st.error(f"❌ Error limpiando cache: {str(e)}")
+            finally:
+                self.sync_lock.release()
         
         return images
     
-    def clear_cache(self) -> bool:
-        """Limpia el cache del equipo actual"""
+    def clear_cache(self, team_slug: str = None) -> bool:
+        """
+        Limpia el cache de un equipo
+        
+        Args:
+            team_slug: Slug del equipo (por defecto el equipo actual)
+        """
         try:
-            team_cache_dir = self.cache_dir / TEAM_SLUG
-            if team_cache_dir.exists():
-                import shutil
-                shutil.rmtree(team_cache_dir)
-                return True
+            with self.sync_lock:
+                return get_cache_manager().evict(team_slug or TEAM_SLUG)
         except Exception as e:
             st.error(f"❌ Error al limpiar cache: {str(e)}")
         
@@ -336,36 +690,353 @@ def get_drive_loader() -> DriveDataLoader:
     return _drive_loader
 
 
+class SyncCoordinator:
+    """
+    Estado de sincronización compartido por todas las sesiones del proceso.
+    
+    Una sesión nueva queda lista en cuanto hay datos en la cache compartida
+    (aunque estén caducados): la revalidación contra Drive la hace el
+    planificador en segundo plano. Solo se espera a Drive con la cache vacía.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.result: Optional[Dict[str, Any]] = None
+        self.synced_at: float = 0.0
+        # Último intento de sincronizar (correcto o no): espaciado de los reintentos
+        self._attempted_at: float = 0.0
+    
+    @property
+    def ready(self) -> bool:
+        """Indica si la última sincronización del proceso fue correcta"""
+        return bool(self.result and self.result.get('success'))
+    
+    def _is_due(self) -> bool:
+        """Indica si hay que reintentar una sincronización fallida"""
+        last_attempt = max(self.synced_at, self._attempted_at)
+        return not self.ready and time.time() - last_attempt >= DRIVE_SYNC_RETRY_SECONDS
+    
+    def _result_from_cache(self) -> Tuple[Dict[str, Any], float]:
+        """
+        Resultado de sincronización construido solo con la cache en disco
+        
+        Returns:
+            (resultado, hora de la última sincronización registrada en el manifest)
+        """
+        loader = get_drive_loader()
+        manifest = loader.get_manifest(TEAM_SLUG)
+        team_report = loader.get_cached_team_report()
+        player_images = manifest.local_files('jugadores')
+        
+        synced_times = [info.get('synced_at', 0) for info in manifest.scopes.values()]
+        return {
+            'team_report': team_report,
+            'player_images': player_images,
+            'download_timings': [],
+            'success': bool(team_report or player_images),
+            'errors': []
+        }, max(synced_times, default=0.0)
+    
+    def _run(self, force_refresh: bool, clear_cache: bool = False) -> Dict[str, Any]:
+        """Sincroniza con el lock entre procesos: solo un proceso descarga a la vez"""
+        loader = get_drive_loader()
+        requested_at = time.time()
+        self._attempted_at = requested_at
+        
+        if not loader.sync_lock.acquire(timeout=DRIVE_SYNC_LOCK_TIMEOUT):
+            # Otro proceso sigue sincronizando: servir la generación anterior
+            # (sin cambiar synced_at: este proceso no ha sincronizado)
+            self.result, _ = self._result_from_cache()
+            return self.result
+        
+        try:
+            # Si otro proceso sincronizó mientras esperábamos, reutilizar su resultado
+            if not clear_cache:
+                cached, cached_at = self._result_from_cache()
+                if cached['success'] and cached_at >= requested_at:
+                    self.result, self.synced_at = cached, cached_at
+                    return self.result
+            
+            if clear_cache:
+                loader.clear_cache()
+            self.result = loader.sync_team_data(force_refresh=force_refresh)
+            if self.result.get('success'):
+                self.synced_at = time.time()
+            return self.result
+        finally:
+            loader.sync_lock.release()
+    
+    def ensure_synced(self) -> Dict[str, Any]:
+        """
+        Devuelve el resultado de sincronización compartido sin esperar a Drive
+        si la cache tiene datos (stale-while-revalidate)
+        
+        Returns:
+            Resultado de la última sincronización del proceso
+        """
+        if self.result is not None and not self._is_due():
+            return self.result
+        
+        with self._lock:
+            # Otra sesión pudo sincronizar mientras esperábamos el lock
+            if self.result is not None and not self._is_due():
+                return self.result
+            
+            # Cache en disco de una ejecución anterior: servirla y revalidar en segundo plano
+            cached, cached_at = self._result_from_cache()
+            if cached['success']:
+                self.result, self.synced_at = cached, cached_at
+                manifest = get_drive_loader().get_manifest(TEAM_SLUG)
+                if not all(manifest.is_fresh(scope) for scope in manifest.scopes):
+                    # Sin esto la primera revalidación esperaría DRIVE_REFRESH_INTERVAL_MINUTES
+                    get_refresh_scheduler().request_refresh()
+                return self.result
+            
+            # Cache vacía: la primera carga tiene que esperar a Drive
+            return self._run(force_refresh=False)
+    
+    def refresh(self, force_refresh: bool = True, clear_cache: bool = False) -> Dict[str, Any]:
+        """
+        Sincronización bajo petición (administración / reintento manual)
+        
+        Args:
+            force_refresh: Comprobar cambios en Drive aunque la cache no haya caducado
+            clear_cache: Borrar la cache del equipo antes de sincronizar
+        
+        Returns:
+            Resultado de la sincronización
+        """
+        def run():
+            with self._lock:
+                return self._run(force_refresh=force_refresh, clear_cache=clear_cache)
+        
+        # Varios clics seguidos (o varias sesiones) comparten la misma sincronización
+        return _drive_flights.do(('refresh', TEAM_SLUG, force_refresh, clear_cache), run)
+    
+    def revalidate(self) -> Dict[str, Any]:
+        """
+        Revalida toda la cache (equipo propio y rivales ya descargados) con el feed
+        de cambios de Drive. Pensado para el planificador en segundo plano.
+        
+        Returns:
+            Resultado de la sincronización
+        """
+        with self._lock:
+            loader = get_drive_loader()
+            
+            # Si otro proceso ya está revalidando, no repetir el trabajo
+            if not loader.sync_lock.acquire(blocking=False):
+                return self.result
+            
+            try:
+                changes = loader.sync_changes()
+                
+                if changes['success']:
+                    self.result, _ = self._result_from_cache()
+                    self.synced_at = time.time()
+                    return self.result
+                
+                # Sin feed de cambios: comprobar el equipo propio listando sus carpetas
+                return self._run(force_refresh=True)
+            finally:
+                loader.sync_lock.release()
+
+
+# Coordinador global de sincronización (compartido entre sesiones)
+_sync_coordinator = None
+_sync_coordinator_lock = threading.Lock()
+
+def get_sync_coordinator() -> SyncCoordinator:
+    """Obtiene el coordinador de sincronización del proceso"""
+    global _sync_coordinator
+    
+    with _sync_coordinator_lock:
+        if _sync_coordinator is None:
+            _sync_coordinator = SyncCoordinator()
+    
+    return _sync_coordinator
+
+
+class DriveRefreshScheduler(threading.Thread):
+    """
+    Hilo en segundo plano (uno por proceso) que revalida la cache de Drive cada
+    DRIVE_REFRESH_INTERVAL_MINUTES y atiende revalidaciones puntuales pedidas por
+    las páginas, para que ninguna petición de usuario espere a Drive.
+    """
+    
+    def __init__(self, interval_seconds: float):
+        super().__init__(name="drive-refresh", daemon=True)
+        self.interval_seconds = interval_seconds
+        self._wake = threading.Event()
+        self._tasks_lock = threading.Lock()
+        self._tasks: Dict[str, Any] = {}
+        self._refresh_requested = False
+        self._last_refresh = time.time()
+    
+    def request_refresh(self):
+        """Pide una revalidación completa lo antes posible"""
+        self._refresh_requested = True
+        self._wake.set()
+    
+    def submit(self, key: str, task):
+        """
+        Encola una revalidación puntual (las repetidas con la misma clave se agrupan)
+        
+        Args:
+            key: Identificador de la tarea (ej: carpeta de Drive)
+            task: Función sin argumentos a ejecutar en segundo plano
+        """
+        with self._tasks_lock:
+            self._tasks.setdefault(key, task)
+        self._wake.set()
+    
+    def run(self):
+        coordinator = get_sync_coordinator()
+        
+        while True:
+            timeout = max(0.0, self._last_refresh + self.interval_seconds - time.time())
+            self._wake.wait(timeout)
+            self._wake.clear()
+            
+            with self._tasks_lock:
+                tasks, self._tasks = self._tasks, {}
+            for key, task in tasks.items():
+                try:
+                    task()
+                except Exception as e:
+                    print(f"⚠️ Error revalidando {key}: {e}")
+            
+            if self._refresh_requested or time.time() - self._last_refresh >= self.interval_seconds:
+                self._refresh_requested = False
+                try:
+                    coordinator.revalidate()
+                except Exception as e:
+                    print(f"⚠️ Error en la sincronización en segundo plano: {e}")
+                self._last_refresh = time.time()
+
+
+# Planificador global (se arranca una sola vez por proceso)
+_refresh_scheduler = None
+_refresh_scheduler_lock = threading.Lock()
+
+def get_refresh_scheduler() -> DriveRefreshScheduler:
+    """Obtiene (y arranca si hace falta) el planificador de revalidación en segundo plano"""
+    global _refresh_scheduler
+    
+    with _refresh_scheduler_lock:
+        if _refresh_scheduler is None:
+            _refresh_scheduler = DriveRefreshScheduler(DRIVE_REFRESH_INTERVAL_MINUTES * 60)
+            _refresh_scheduler.start()
+    
+    return _refresh_scheduler
+
+
 def auto_sync_on_load():
     """Sincronización automática silenciosa al cargar la aplicación"""
     if 'drive_synced' not in st.session_state:
-        loader = get_drive_loader()
-        
-        # En producción (Streamlit Cloud), verificar si hay cache antes de sincronizar
-        is_production = not Path("credentials/google_drive_credentials.json").exists()
+        coordinator = get_sync_coordinator()
         
         try:
-            if is_production:
-                # En producción, siempre sincronizar la primera vez
-                result = loader.sync_team_data(force_refresh=True)
-            else:
-                # En desarrollo, usar cache si existe
-                result = loader.sync_team_data(force_refresh=False)
+            # Si hay datos en la cache compartida, esto es inmediato
+            result = coordinator.ensure_synced()
+            get_refresh_scheduler()
             
             st.session_state['drive_synced'] = result['success']
-            st.session_state['sync_timestamp'] = time.time()
+            st.session_state['sync_timestamp'] = coordinator.synced_at
         except:
             # Fallar silenciosamente
             st.session_state['drive_synced'] = False
 
 
-def load_players() -> List[Dict[str, Any]]:
+@st.cache_resource(ttl=PLAYERS_CACHE_TTL_SECONDS, max_entries=PLAYERS_CACHE_MAX_ENTRIES, show_spinner=False)
+def _build_team_players(image_filenames: Tuple[str, ...], roster_key: str) -> Tuple[Player, ...]:
+    """
+    Jugadores del equipo propio a partir de sus imágenes en cache y del Excel.
+    Los Player son inmutables: el resultado se comparte entre sesiones sin copiarlo.
+    
+    Args:
+        image_filenames: Nombres de las imágenes PNG en cache (ordenados)
+        roster_key: Versión del Excel (solo forma parte de la clave de cache)
+    
+    Returns:
+        Tupla de Player ordenada por dorsal
+    """
+    df = load_roster()
+    name_index = get_name_index()
+    
+    # Validar en paralelo todas las URLs de imagen del equipo (resultados cacheados)
+    team_rows = name_index.team_rows(TEAM_NAME_DISPLAY)
+    get_image_probe().probe_many(df.loc[team_rows, 'IMAGEN'].dropna().astype(str))
+    
+    # INVERTIR LA LÓGICA: partir de las imágenes en Drive y buscar en Excel
+    players_data = []
+    used_players = set()  # Para evitar que un jugador del Excel se use múltiples veces
+    
+    for image_filename in image_filenames:
+        # Buscar coincidencia en el Excel mediante el índice de nombres
+        # Formato: APELLIDOS_NOMBRE.png o APELLIDOS_INICIAL.png
+        matching_index = name_index.match(image_filename, TEAM_NAME_DISPLAY, used_players)
+        
+        if matching_index is not None:
+            # Marcar este jugador como usado
+            used_players.add(matching_index)
+            
+            # Extraer datos del jugador desde Excel (celdas vacías como '')
+            matching_player = df.loc[matching_index]
+            full_name = row_text(matching_player, 'JUGADOR')
+            surnames, name = name_index.name_parts(matching_index)
+            
+            dorsal = int(matching_player['DORSAL']) if pd.notna(matching_player['DORSAL']) else 0
+            
+            # Crear slug único usando nombre del archivo para evitar duplicados
+            slug = image_filename.replace('.png', '').lower()
+            
+            player_data = Player(
+                number=dorsal,
+                name=name,
+                surnames=surnames,
+                slug=slug,
+                full_name=full_name,
+                team=row_text(matching_player, 'EQUIPO'),
+                image_url=_safe_image_url(row_text(matching_player, 'IMAGEN')),
+                image_filename=image_filename,
+                # Totales y estadísticas derivadas precalculadas para todo el Excel
+                **player_stats(matching_index)
+            )
+            players_data.append(player_data)
+        else:
+            # Crear jugador genérico para imágenes sin coincidencia en Excel
+            # Extraer nombre del archivo para mostrar
+            name_from_file = image_filename.replace('.png', '').replace('_', ' ').title()
+            
+            # Crear slug único usando nombre del archivo
+            slug = image_filename.replace('.png', '').lower()
+            
+            player_data = Player(
+                number=0,
+                name=name_from_file.split()[-1] if name_from_file else "Jugador",
+                surnames=' '.join(name_from_file.split()[:-1]) if len(name_from_file.split()) > 1 else "Sin Datos",
+                slug=slug,
+                full_name=name_from_file,
+                team=TEAM_NAME_DISPLAY,
+                image_url='',  # Sin URL, usará imagen genérica
+                image_filename=image_filename
+            )
+            players_data.append(player_data)
+    
+    # Ordenar por dorsal
+    players_data.sort(key=lambda x: x.number)
+    
+    return tuple(players_data)
+
+
+def load_players() -> List[Player]:
     """
     Carga la lista de jugadores basándose ÚNICAMENTE en las imágenes disponibles en Google Drive.
     Invierte la lógica: parte de las imágenes en Drive y busca su información en el Excel.
     
     Returns:
-        Lista de diccionarios con datos de jugadores que tienen imagen PNG en Google Drive
+        Lista de Player de los jugadores que tienen imagen PNG en Google Drive
     """
     try:
         # Sincronizar automáticamente si es necesario
@@ -376,8 +1047,8 @@ def load_players() -> List[Dict[str, Any]]:
         available_images = loader.get_cached_player_images()
         
         if not available_images:
-            # Si no hay imágenes en cache, intentar descargar
-            available_images = loader.download_player_images(force_refresh=False)
+            # Si no hay imágenes en cache, descargar con el lock entre procesos (coordinador)
+            available_images = get_sync_coordinator().refresh(force_refresh=False).get('player_images') or {}
         
         if not available_images:
             st.warning("⚠️ No hay imágenes disponibles en Google Drive")
@@ -388,142 +1059,15 @@ def load_players() -> List[Dict[str, Any]]:
             st.error(f"❌ No se encuentra el archivo Excel: {EXCEL_FILE}")
             return []
         
-        df = pd.read_excel(EXCEL_FILE)
+        name_index = get_name_index()
         
         # Filtrar solo jugadores del equipo actual
-        team_players = df[df['EQUIPO'] == TEAM_NAME_DISPLAY].copy()
-        
-        if len(team_players) == 0:
+        if not name_index.team_rows(TEAM_NAME_DISPLAY):
             st.warning(f"⚠️ No se encontraron jugadores para el equipo: {TEAM_NAME_DISPLAY}")
             return []
         
-        # Rellenar valores NaN
-        team_players = team_players.fillna("")
-        
-        # INVERTIR LA LÓGICA: partir de las imágenes en Drive y buscar en Excel
-        players_data = []
-        used_players = set()  # Para evitar que un jugador del Excel se use múltiples veces
-        
-        for image_filename in available_images.keys():
-            # Extraer información del nombre del archivo
-            # Formato: APELLIDOS_NOMBRE.png o APELLIDOS_INICIAL.png
-            image_base = image_filename.replace('.png', '').upper()
-            
-            # Buscar coincidencia en el Excel
-            matching_player = None
-            matching_index = None
-            
-            for idx, row in team_players.iterrows():
-                # Saltar si este jugador ya fue usado
-                if idx in used_players:
-                    continue
-                    
-                full_name = row['JUGADOR']
-                
-                # Extraer apellidos y nombre del Excel
-                if ',' in full_name:
-                    # Formato: "APELLIDOS, NOMBRE"
-                    parts = full_name.split(',', 1)
-                    surnames = parts[0].strip()
-                    name = parts[1].strip() if len(parts) > 1 else ""
-                    name = name.split()[0] if name else "N"
-                    name = name[0] if name else "N"
-                else:
-                    # Formato: "INICIAL. APELLIDOS"
-                    name_parts = full_name.split(' ', 1) if full_name else ['', '']
-                    if len(name_parts) >= 2:
-                        first_part = name_parts[0].replace('.', '').strip()
-                        surnames = name_parts[1]
-                        name = first_part
-                    else:
-                        name = full_name[:1] if full_name else "N"
-                        surnames = full_name[2:] if len(full_name) > 2 else "APELLIDOS"
-                
-                # Normalizar para comparación
-                surnames_normalized = surnames.upper().replace(' ', '_').replace('Ñ', 'N').replace(',', '')
-                name_normalized = name.upper().replace('Á', 'A').replace('É', 'E').replace('Í', 'I').replace('Ó', 'O').replace('Ú', 'U').replace('Ü', 'U')
-                
-                # Verificar si coincide con el archivo
-                expected_pattern = f"{surnames_normalized}_{name_normalized}"
-                expected_pattern_initial = f"{surnames_normalized}_{name_normalized[0]}" if len(name_normalized) > 1 else expected_pattern
-                
-                if (image_base == expected_pattern or 
-                    image_base == expected_pattern_initial or
-                    image_base.startswith(surnames_normalized + '_')):
-                    matching_player = row
-                    matching_index = idx
-                    break
-            
-            if matching_player is not None and matching_index is not None:
-                # Marcar este jugador como usado
-                used_players.add(matching_index)
-                
-                # Extraer datos del jugador desde Excel
-                full_name = matching_player['JUGADOR']
-                
-                # Re-extraer nombre y apellidos para estructura final
-                if ',' in full_name:
-                    parts = full_name.split(',', 1)
-                    surnames = parts[0].strip()
-                    name = parts[1].strip() if len(parts) > 1 else ""
-                    name = name.split()[0] if name else "N"
-                    name = name[0] if name else "N"
-                else:
-                    name_parts = full_name.split(' ', 1) if full_name else ['', '']
-                    if len(name_parts) >= 2:
-                        first_part = name_parts[0].replace('.', '').strip()
-                        surnames = name_parts[1]
-                        name = first_part
-                    else:
-                        name = full_name[:1] if full_name else "N"
-                        surnames = full_name[2:] if len(full_name) > 2 else "APELLIDOS"
-                
-                dorsal = int(matching_player['DORSAL']) if pd.notna(matching_player['DORSAL']) else 0
-                
-                # Crear slug único usando nombre del archivo para evitar duplicados
-                slug = image_filename.replace('.png', '').lower()
-                
-                player_data = {
-                    'number': dorsal,
-                    'name': name,
-                    'surnames': surnames,
-                    'slug': slug,
-                    'full_name': full_name,
-                    'team': matching_player['EQUIPO'],
-                    'image_url': _safe_image_url(str(matching_player.get('IMAGEN', ''))),
-                    'image_filename': image_filename,
-                    'points': int(matching_player['PUNTOS']) if pd.notna(matching_player['PUNTOS']) else 0,
-                    'minutes': float(matching_player['MINUTOS JUGADOS']) if pd.notna(matching_player['MINUTOS JUGADOS']) else 0.0,
-                    'games_played': int(matching_player['PJ']) if pd.notna(matching_player['PJ']) else 0
-                }
-                players_data.append(player_data)
-            else:
-                # Crear jugador genérico para imágenes sin coincidencia en Excel
-                # Extraer nombre del archivo para mostrar
-                name_from_file = image_filename.replace('.png', '').replace('_', ' ').title()
-                
-                # Crear slug único usando nombre del archivo
-                slug = image_filename.replace('.png', '').lower()
-                
-                player_data = {
-                    'number': 0,
-                    'name': name_from_file.split()[-1] if name_from_file else "Jugador",
-                    'surnames': ' '.join(name_from_file.split()[:-1]) if len(name_from_file.split()) > 1 else "Sin Datos",
-                    'slug': slug,
-                    'full_name': name_from_file,
-                    'team': TEAM_NAME_DISPLAY,
-                    'image_url': '',  # Sin URL, usará imagen genérica
-                    'image_filename': image_filename,
-                    'points': 0,
-                    'minutes': 0.0,
-                    'games_played': 0
-                }
-                players_data.append(player_data)
-        
-        # Ordenar por dorsal
-        players_data.sort(key=lambda x: x['number'])
-        
-        return players_data
+        # Lista compartida entre sesiones: solo se reconstruye si cambian las imágenes o el Excel
+        return list(_build_team_players(tuple(sorted(available_images)), get_roster_snapshot().key))
             
     except Exception as e:
         # Fallar silenciosamente
@@ -548,14 +1092,32 @@ def get_team_report_path() -> Optional[Path]:
         if cached_report and cached_report.exists():
             return cached_report
         
-        # Si no está en cache, intentar descargar
-        return loader.download_team_report(force_refresh=False)
+        # Si no está en cache, descargar con el lock entre procesos (coordinador)
+        return get_sync_coordinator().refresh(force_refresh=False).get('team_report')
         
     except Exception as e:
         st.error(f"❌ Error obteniendo informe del equipo: {str(e)}")
         return None
 
 
+def _fetch_single_player_image(image_name: str) -> Optional[Path]:
+    """Descarga una imagen suelta del equipo con el lock entre procesos (en segundo plano)"""
+    loader = get_drive_loader()
+    
+    # Sin esperar al lock: quien lo tiene está sincronizando el equipo completo
+    if not loader.sync_lock.acquire(blocking=False):
+        return None
+    
+    try:
+        # Otro proceso pudo descargarla desde que se encoló la tarea
+        cached_image = loader.get_cached_player_image(image_name)
+        if cached_image:
+            return cached_image
+        return loader.fetch_player_image(image_name)
+    finally:
+        loader.sync_lock.release()
+
+
 def get_player_image_path(player_name: str) -> Optional[Path]:
     """
     Obtiene la ruta de la imagen de un jugador desde Google Drive
@@ -575,19 +1137,16 @@ def get_player_image_path(player_name: str) -> Optional[Path]:
         # Normalizar nombre del archivo
         normalized_name = player_name.lower()
         
-        # Obtener imágenes desde cache
-        cached_images = loader.get_cached_player_images()
-        
-        if normalized_name in cached_images:
-            return cached_images[normalized_name]
-        
-        # Si no está en cache, intentar descargar TODAS las imágenes
-        downloaded_images = loader.download_player_images(force_refresh=True)
+        # Obtener la imagen desde cache
+        cached_image = loader.get_cached_player_image(normalized_name)
+        if cached_image:
+            return cached_image
         
-        if normalized_name in downloaded_images:
-            return downloaded_images[normalized_name]
-        
-        # Si aún no se encuentra, retornar None silenciosamente
+        # Si no está en cache ni se sabe ausente en Drive, descargar solo ese archivo en
+        # segundo plano y mostrar el marcador hasta la siguiente ejecución de la página
+        if not loader.is_known_missing(normalized_name):
+            get_refresh_scheduler().submit(f"imagen:{normalized_name}",
+                                           lambda: _fetch_single_player_image(normalized_name))
         return None
         
     except Exception as e:
@@ -598,17 +1157,15 @@ def get_player_image_path(player_name: str) -> Optional[Path]:
 def force_sync():
     """Fuerza una sincronización completa con Google Drive"""
     try:
-        loader = get_drive_loader()
+        coordinator = get_sync_coordinator()
         
         # Limpiar cache antes de sincronizar
         st.info("🧹 Limpiando cache antes de sincronización...")
-        loader.clear_cache()
-        
-        result = loader.sync_team_data(force_refresh=True)
+        result = coordinator.refresh(force_refresh=True, clear_cache=True)
         
         # Actualizar estado de sesión
         st.session_state['drive_synced'] = result['success']
-        st.session_state['sync_timestamp'] = time.time()
+        st.session_state['sync_timestamp'] = coordinator.synced_at
         
         return result
         
@@ -644,16 +1201,84 @@ def debug_player_files():
 
 def get_sync_status() -> Dict[str, Any]:
     """Obtiene el estado actual de sincronización"""
+    coordinator = get_sync_coordinator()
     return {
-        'is_synced': st.session_state.get('drive_synced', False),
-        'last_sync': st.session_state.get('sync_timestamp', 0),
+        'is_synced': coordinator.ready,
+        'last_sync': coordinator.synced_at,
         'drive_available': get_drive_client() is not None
     }
 
 
+def _download_team_report_by_drive_id(team_slug: str, drive_id: str) -> Optional[Path]:
+    """
+    Busca el informe de un equipo en Drive y lo descarga a la cache solo si cambió
+    
+    Args:
+        team_slug: Slug del equipo (para cache)
+        drive_id: ID de la carpeta del equipo en Google Drive
+    
+    Returns:
+        Path al archivo del informe o None si no está disponible
+    """
+    drive_client = get_drive_client()
+    if not drive_client or not drive_client.is_authenticated():
+        return None
+    
+    team_cache_dir = DRIVE_CACHE_DIR / team_slug
+    cached_file = team_cache_dir / f"{team_slug}.pdf"
+    loader = get_drive_loader()
+    manifest = loader.get_manifest(team_slug)
+    
+    # Buscar archivo PDF del equipo en Google Drive
+    files = drive_client.catalog_files(drive_id, 'pdf')
+    
+    team_pdf = None
+    for file in files:
+        file_name_lower = file['name'].lower()
+        # Buscar archivos PDF que puedan ser el informe del equipo
+        if (team_slug.lower() in file_name_lower or 
+            'informe' in file_name_lower or 
+            'report' in file_name_lower or
+            file_name_lower.endswith('.pdf')):
+            team_pdf = file
+            break
+    
+    if not team_pdf:
+        return None
+    
+    # Descargar el archivo a la ruta de cache solo si cambió en Drive
+    synced = loader.sync_files(manifest, 'informe', drive_id, [team_pdf], team_cache_dir,
+                               local_name=cached_file.name)
+    return synced.get(cached_file.name)
+
+
+def _fetch_team_report_by_drive_id(team_slug: str, drive_id: str) -> Optional[Path]:
+    """Descarga el informe de un rival (una sola descarga en curso por carpeta)"""
+    return _drive_flights.do(('informe', drive_id),
+                             lambda: _fetch_team_report_locked(team_slug, drive_id))
+
+
+def _fetch_team_report_locked(team_slug: str, drive_id: str) -> Optional[Path]:
+    """Descarga el informe de un rival con el lock entre procesos"""
+    loader = get_drive_loader()
+    cached_file = DRIVE_CACHE_DIR / team_slug / f"{team_slug}.pdf"
+    
+    if not loader.sync_lock.acquire(timeout=DRIVE_SYNC_LOCK_TIMEOUT):
+        return cached_file if cached_file.exists() else None
+    
+    try:
+        # Otro proceso pudo actualizarlo mientras esperábamos el lock
+        if cached_file.exists() and loader.get_manifest(team_slug).is_fresh('informe'):
+            return cached_file
+        return _download_team_report_by_drive_id(team_slug, drive_id)
+    finally:
+        loader.sync_lock.release()
+
+
 def get_team_report_path_by_drive_id(team_name: str, team_slug: str, drive_id: str) -> Optional[Path]:
     """
-    Obtiene la ruta del informe de cualquier equipo desde Google Drive basándose en su drive_id
+    Obtiene la ruta del informe de cualquier equipo desde Google Drive basándose en su drive_id.
+    Si hay copia en cache se sirve aunque esté caducada y se revalida en segundo plano.
     
     Args:
         team_name: Nombre del equipo 
@@ -664,9 +1289,8 @@ def get_team_report_path_by_drive_id(team_name: str, team_slug: str, drive_id: s
         Path al archivo del informe o None si no está disponible
     """
     try:
-        drive_client = get_drive_client()
-        if not drive_client or not drive_client.is_authenticated():
-            return None
+        # Es el rival seleccionado: no expulsarlo de la cache mientras se consulte
+        get_cache_manager().touch(team_slug, pin=True)
         
         # Crear carpeta de cache para este equipo específico
         team_cache_dir = DRIVE_CACHE_DIR / team_slug
@@ -675,42 +1299,213 @@ def get_team_report_path_by_drive_id(team_name: str, team_slug: str, drive_id: s
         # Ruta del archivo en cache
         cached_file = team_cache_dir / f"{team_slug}.pdf"
         
-        # Verificar si el archivo en cache es válido (menos de CACHE_EXPIRY_HOURS horas)
         if cached_file.exists():
-            file_age_hours = (time.time() - cached_file.stat().st_mtime) / 3600
-            if file_age_hours < CACHE_EXPIRY_HOURS:
-                return cached_file
-        
-        # Buscar archivo PDF del equipo en Google Drive
-        files = drive_client.list_files_in_folder(drive_id, 'pdf')
-        
-        team_pdf = None
-        for file in files:
-            file_name_lower = file['name'].lower()
-            # Buscar archivos PDF que puedan ser el informe del equipo
-            if (team_slug.lower() in file_name_lower or 
-                'informe' in file_name_lower or 
-                'report' in file_name_lower or
-                file_name_lower.endswith('.pdf')):
-                team_pdf = file
-                break
-        
-        if not team_pdf:
-            return None
-        
-        # Descargar el archivo directamente a la ruta de cache
-        success = drive_client.download_file(team_pdf['id'], cached_file)
-        if not success:
-            return None
+            # Caducado (más de CACHE_EXPIRY_HOURS horas): servir la copia y revalidar sin esperar
+            if not get_drive_loader().get_manifest(team_slug).is_fresh('informe'):
+                get_refresh_scheduler().submit(
+                    f"informe:{drive_id}",
+                    lambda: _fetch_team_report_by_drive_id(team_slug, drive_id)
+                )
+            return cached_file
         
-        return cached_file
+        # Sin copia local: hay que esperar a Drive
+        return _fetch_team_report_by_drive_id(team_slug, drive_id)
         
     except Exception as e:
         st.error(f"❌ Error cargando informe de {team_name}: {str(e)}")
         return None
 
 
-def load_players_by_drive_id(team_name: str, team_slug: str, drive_id: str) -> List[Dict[str, Any]]:
+def _download_player_images_by_drive_id(team_slug: str, drive_id: str) -> Dict[str, Path]:
+    """
+    Sincroniza la carpeta de jugadores de un equipo con la cache local
+    
+    Args:
+        team_slug: Slug del equipo (para cache)
+        drive_id: ID de la carpeta del equipo en Google Drive
+    
+    Returns:
+        Diccionario con {nombre_archivo: path_local}
+    """
+    drive_client = get_drive_client()
+    if not drive_client or not drive_client.is_authenticated():
+        return {}
+    
+    team_images_cache_dir = DRIVE_CACHE_DIR / team_slug / "jugadores"
+    loader = get_drive_loader()
+    manifest = loader.get_manifest(team_slug)
+    
+    # Buscar carpeta de jugadores dentro de la carpeta del equipo
+    folders = drive_client.catalog_folders(drive_id)
+    jugadores_folder_id = None
+    
+    for folder in folders:
+        if folder['name'].lower() in ['jugadores', 'players']:
+            jugadores_folder_id = folder['id']
+            break
+    
+    if not jugadores_folder_id:
+        return {}
+    
+    # Obtener lista de archivos de imagen en la carpeta de jugadores
+    # (el filtro 'png' ya incluye image/jpeg)
+    image_files = drive_client.catalog_iter_files(jugadores_folder_id, 'png')
+    
+    # Descargar solo imágenes nuevas o modificadas, en paralelo
+    report = []
+    available_images = loader.sync_files(manifest, 'jugadores', jugadores_folder_id,
+                                         image_files, team_images_cache_dir, report=report)
+    for item in report:
+        if item['success']:
+            print(f"⬇️ {item['path'].name}: {item['bytes']} bytes en {item['seconds']:.2f}s")
+    return available_images
+
+
+def _fetch_player_images_by_drive_id(team_slug: str, drive_id: str) -> Dict[str, Path]:
+    """Sincroniza las imágenes de un rival (una sola sincronización en curso por carpeta)"""
+    return _drive_flights.do(('jugadores', drive_id),
+                             lambda: _fetch_player_images_locked(team_slug, drive_id))
+
+
+def _fetch_player_images_locked(team_slug: str, drive_id: str) -> Dict[str, Path]:
+    """Sincroniza las imágenes de un rival con el lock entre procesos"""
+    loader = get_drive_loader()
+    
+    if not loader.sync_lock.acquire(timeout=DRIVE_SYNC_LOCK_TIMEOUT):
+        return loader.get_manifest(team_slug).local_files('jugadores')
+    
+    try:
+        # Otro proceso pudo sincronizarlas mientras esperábamos el lock
+        manifest = loader.get_manifest(team_slug)
+        cached_images = manifest.local_files('jugadores')
+        if cached_images and manifest.is_fresh('jugadores'):
+            return cached_images
+        return _download_player_images_by_drive_id(team_slug, drive_id)
+    finally:
+        loader.sync_lock.release()
+
+
+@st.cache_resource(ttl=PLAYERS_CACHE_TTL_SECONDS, max_entries=PLAYERS_CACHE_MAX_ENTRIES, show_spinner=False)
+def _build_rival_players(team_name: str, images: Tuple[Tuple[str, str], ...], roster_key: str) -> Tuple[Player, ...]:
+    """
+    Jugadores de un equipo a partir de sus imágenes en cache y del Excel.
+    Los Player son inmutables: el resultado se comparte entre sesiones sin copiarlo.
+    
+    Args:
+        team_name: Nombre del equipo
+        images: Pares (nombre de la imagen, ruta local) ordenados
+        roster_key: Versión del Excel ('' si no hay Excel; solo forma parte de la clave de cache)
+    
+    Returns:
+        Tupla de Player
+    """
+    # Cargar datos del Excel
+    if not roster_key:
+        # Si no hay Excel, crear jugadores basados solo en los nombres de archivo
+        players_data = []
+        for image_filename, image_path in images:
+            image_base = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
+            
+            # Intentar extraer nombre del archivo
+            if '_' in image_base:
+                parts = image_base.split('_')
+                surnames = parts[0].replace('_', ' ')
+                name = parts[1] if len(parts) > 1 else 'N'
+            else:
+                surnames = image_base
+                name = 'N'
+            
+            players_data.append(Player(
+                name=name,
+                surnames=surnames,
+                slug=image_base.lower(),
+                full_name=f"{name} {surnames}",
+                team=team_name,
+                image_path=image_path,
+                image_filename=image_filename
+            ))
+        
+        return tuple(players_data)
+    
+    # Cargar Excel y buscar coincidencias
+    df = load_roster()
+    name_index = get_name_index()
+    
+    # Buscar solo entre los jugadores del equipo; si el nombre de la carpeta
+    # no coincide con ningún EQUIPO del Excel, buscar en toda la liga
+    match_team = team_name if name_index.team_rows(team_name) else None
+    
+    # INVERTIR LA LÓGICA: partir de las imágenes en Drive y buscar en Excel
+    players_data = []
+    used_players = set()
+    
+    for image_filename, image_path in images:
+        # Buscar coincidencia en el Excel mediante el índice de nombres
+        matching_index = name_index.match(image_filename, match_team, used_players)
+        
+        if matching_index is not None:
+            used_players.add(matching_index)
+            
+            # Extraer datos del Excel (celdas vacías como '')
+            matching_player = df.loc[matching_index]
+            full_name = row_text(matching_player, 'JUGADOR')
+            surnames, name = name_index.name_parts(matching_index)
+            
+            # Extraer dorsal y otros datos del Excel
+            dorsal = int(matching_player['DORSAL']) if pd.notna(matching_player['DORSAL']) else 0
+            imagen_url = row_text(matching_player, 'IMAGEN')
+            
+            # Crear slug único usando nombre del archivo
+            slug = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '').lower()
+            
+            players_data.append(Player(
+                number=dorsal,
+                name=name,
+                surnames=surnames,
+                slug=slug,
+                full_name=full_name,
+                team=team_name,  # Usar el nombre del equipo actual, no del Excel
+                image_url=imagen_url,  # URL del Excel
+                image_filename=image_filename,
+                image_path=image_path,  # Ruta local de la imagen
+                position=row_text(matching_player, 'POSICION'),
+                height=row_text(matching_player, 'ALTURA'),
+                age=row_text(matching_player, 'EDAD'),
+                **player_stats(matching_index),
+                bio_url=row_text(matching_player, 'BIO_URL'),
+                photo_url=row_text(matching_player, 'FOTO_URL')
+            ))
+        else:
+            # No se encontró en Excel, crear entrada básica
+            image_base_clean = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
+            
+            if '_' in image_base_clean:
+                parts = image_base_clean.split('_')
+                surnames = parts[0].replace('_', ' ')
+                name = parts[1] if len(parts) > 1 else 'N'
+            else:
+                surnames = image_base_clean
+                name = 'N'
+            
+            # Crear slug único
+            slug = image_base_clean.lower()
+            
+            players_data.append(Player(
+                number=0,  # Sin dorsal
+                name=name,
+                surnames=surnames,
+                slug=slug,
+                full_name=f"{name} {surnames}",
+                team=team_name,
+                image_url='',  # Vacío para usar imagen local
+                image_filename=image_filename,
+                image_path=image_path  # Ruta local de la imagen
+            ))
+    
+    return tuple(players_data)
+
+
+def load_players_by_drive_id(team_name: str, team_slug: str, drive_id: str) -> List[Player]:
     """
     Carga la lista de jugadores de cualquier equipo desde Google Drive basándose en su drive_id
     
@@ -720,257 +1515,42 @@ def load_players_by_drive_id(team_name: str, team_slug: str, drive_id: str) -> L
         drive_id: ID de la carpeta del equipo en Google Drive
     
     Returns:
-        Lista de diccionarios con datos de jugadores
+        Lista de Player con los jugadores del equipo
     """
     try:
         drive_client = get_drive_client()
         if not drive_client or not drive_client.is_authenticated():
             return []
         
-        # Buscar carpeta de jugadores dentro de la carpeta del equipo
-        folders = drive_client.list_folders_in_folder(drive_id)
-        jugadores_folder_id = None
-        
-        for folder in folders:
-            if folder['name'].lower() in ['jugadores', 'players']:
-                jugadores_folder_id = folder['id']
-                break
-        
-        if not jugadores_folder_id:
-            return []
+        # Es el rival seleccionado: no expulsarlo de la cache mientras se consulte
+        get_cache_manager().touch(team_slug, pin=True)
         
         # Crear carpeta de cache para imágenes de este equipo
         team_images_cache_dir = DRIVE_CACHE_DIR / team_slug / "jugadores"
         team_images_cache_dir.mkdir(parents=True, exist_ok=True)
+        loader = get_drive_loader()
+        manifest = loader.get_manifest(team_slug)
         
-        # Obtener lista de archivos de imagen en la carpeta de jugadores
-        image_files = drive_client.list_files_in_folder(jugadores_folder_id, 'png')
-        image_files.extend(drive_client.list_files_in_folder(jugadores_folder_id, 'jpg'))
-        image_files.extend(drive_client.list_files_in_folder(jugadores_folder_id, 'jpeg'))
+        # Servir la cache aunque esté caducada y revalidarla en segundo plano
+        available_images = manifest.local_files('jugadores')
         
-        if not image_files:
-            return []
+        if available_images and not manifest.is_fresh('jugadores'):
+            get_refresh_scheduler().submit(
+                f"jugadores:{drive_id}",
+                lambda: _fetch_player_images_by_drive_id(team_slug, drive_id)
+            )
         
-        # Descargar imágenes que no estén en cache
-        available_images = {}
-        for image_file in image_files:
-            image_filename = image_file['name']
-            cached_image_path = team_images_cache_dir / image_filename
-            
-            # Verificar si la imagen está en cache y es válida
-            if cached_image_path.exists():
-                file_age_hours = (time.time() - cached_image_path.stat().st_mtime) / 3600
-                if file_age_hours < CACHE_EXPIRY_HOURS:
-                    available_images[image_filename] = cached_image_path
-                    continue
-            
-            # Descargar imagen
-            success = drive_client.download_file(image_file['id'], cached_image_path)
-            if success:
-                available_images[image_filename] = cached_image_path
+        if not available_images:
+            # Sin copia local: hay que esperar a Drive
+            available_images = _fetch_player_images_by_drive_id(team_slug, drive_id)
         
         if not available_images:
             return []
         
-        # Cargar datos del Excel
-        if not EXCEL_FILE.exists():
-            # Si no hay Excel, crear jugadores basados solo en los nombres de archivo
-            players_data = []
-            for image_filename in available_images.keys():
-                image_base = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
-                
-                # Intentar extraer nombre del archivo
-                if '_' in image_base:
-                    parts = image_base.split('_')
-                    surnames = parts[0].replace('_', ' ')
-                    name = parts[1] if len(parts) > 1 else 'N'
-                else:
-                    surnames = image_base
-                    name = 'N'
-                
-                players_data.append({
-                    'name': name,
-                    'surnames': surnames,
-                    'full_name': f"{name} {surnames}",
-                    'position': '',
-                    'height': '',
-                    'age': '',
-                    'team': team_name,
-                    'image_path': str(available_images[image_filename]),
-                    'image_filename': image_filename
-                })
-            
-            return players_data
-        
-        # Cargar Excel y buscar coincidencias
-        df = pd.read_excel(EXCEL_FILE)
-        df = df.fillna("")
-        
-        print(f"📊 Excel: {len(df)} jugadores | Equipo: {team_name} | Imágenes: {len(available_images)}")
-        print(f"📝 Columnas disponibles: {list(df.columns)}")
-        
-        # Buscar columnas relacionadas con imágenes
-        image_columns = [col for col in df.columns if 'IMAGEN' in col.upper() or 'FOTO' in col.upper() or 'PHOTO' in col.upper()]
-        print(f"🖼️ Columnas de imagen encontradas: {image_columns}")
-        
-        if image_columns:
-            for col in image_columns:
-                sample_values = df[col].dropna().head(3).tolist()
-                print(f"   {col}: ejemplos = {sample_values}")
-        
-        # INVERTIR LA LÓGICA: partir de las imágenes en Drive y buscar en Excel
-        players_data = []
-        used_players = set()
-        
-        for image_filename, image_path in available_images.items():
-            # Extraer información del nombre del archivo
-            image_base = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '').upper()
-            
-            # Buscar coincidencia en el Excel (buscar en cualquier equipo, no solo el actual)
-            matching_player = None
-            matching_index = None
-            
-            for idx, row in df.iterrows():
-                if idx in used_players:
-                    continue
-                    
-                full_name = row.get('JUGADOR', '')
-                if not full_name:
-                    continue
-                
-                # Extraer apellidos y nombre del Excel
-                if ',' in full_name:
-                    parts = full_name.split(',', 1)
-                    surnames = parts[0].strip()
-                    name = parts[1].strip() if len(parts) > 1 else ""
-                    name = name.split()[0] if name else "N"
-                    name = name[0] if name else "N"
-                else:
-                    name_parts = full_name.split(' ', 1) if full_name else ['', '']
-                    if len(name_parts) >= 2:
-                        first_part = name_parts[0].replace('.', '').strip()
-                        surnames = name_parts[1]
-                        name = first_part
-                    else:
-                        name = full_name[:1] if full_name else "N"
-                        surnames = full_name[2:] if len(full_name) > 2 else "APELLIDOS"
-                
-                # Normalizar para comparación
-                surnames_normalized = surnames.upper().replace(' ', '_').replace('Ñ', 'N').replace(',', '')
-                name_normalized = name.upper().replace('Á', 'A').replace('É', 'E').replace('Í', 'I').replace('Ó', 'O').replace('Ú', 'U').replace('Ü', 'U')
-                
-                # Verificar coincidencias
-                expected_pattern = f"{surnames_normalized}_{name_normalized}"
-                expected_pattern_initial = f"{surnames_normalized}_{name_normalized[0]}" if len(name_normalized) > 1 else expected_pattern
-                
-                if (image_base == expected_pattern or 
-                    image_base == expected_pattern_initial or
-                    image_base.startswith(surnames_normalized + '_')):
-                    matching_player = row
-                    matching_index = idx
-                    print(f"✅ MATCH: {image_filename} → {full_name}")
-                    break
-            
-            if matching_player is not None and matching_index is not None:
-                used_players.add(matching_index)
-                
-                # Extraer datos del Excel
-                full_name = matching_player['JUGADOR']
-                
-                if ',' in full_name:
-                    parts = full_name.split(',', 1)
-                    surnames = parts[0].strip()
-                    name = parts[1].strip() if len(parts) > 1 else ""
-                    name = name.split()[0] if name else "N"
-                    name = name[0] if name else "N"
-                else:
-                    name_parts = full_name.split(' ', 1) if full_name else ['', '']
-                    if len(name_parts) >= 2:
-                        first_part = name_parts[0].replace('.', '').strip()
-                        surnames = name_parts[1]
-                        name = first_part
-                    else:
-                        name = full_name[:1] if full_name else "N"
-                        surnames = full_name[2:] if len(full_name) > 2 else "APELLIDOS"
-                
-                # Extraer dorsal y otros datos del Excel
-                dorsal = int(matching_player['DORSAL']) if pd.notna(matching_player['DORSAL']) else 0
-                imagen_url = matching_player.get('IMAGEN', '')
-                
-                print(f"📊 DATOS EXCEL:")
-                print(f"   👤 Jugador: {full_name}")
-                print(f"   🔢 Dorsal: {dorsal}")
-                print(f"   📸 IMAGEN columna: '{imagen_url}' (tipo: {type(imagen_url)}, is_null: {pd.isna(imagen_url)})")
-                print(f"   📁 image_path local: {image_path}")
-                print(f"   🗂️ image_filename: {image_filename}")
-                
-                # Verificar todas las columnas disponibles que empiecen con IMAGEN o FOTO
-                available_cols = [col for col in matching_player.index if 'IMAGEN' in col.upper() or 'FOTO' in col.upper()]
-                print(f"   🔍 Columnas imagen disponibles: {available_cols}")
-                for col in available_cols:
-                    print(f"      {col}: '{matching_player.get(col, 'N/A')}'")
-                
-                # Crear slug único usando nombre del archivo
-                slug = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '').lower()
-                
-                players_data.append({
-                    'number': dorsal,
-                    'name': name,
-                    'surnames': surnames,
-                    'slug': slug,
-                    'full_name': full_name,
-                    'team': team_name,  # Usar el nombre del equipo actual, no del Excel
-                    'image_url': imagen_url,  # URL del Excel
-                    'image_filename': image_filename,
-                    'image_path': str(image_path),  # Ruta local de la imagen
-                    'position': matching_player.get('POSICION', ''),
-                    'height': matching_player.get('ALTURA', ''),
-                    'age': matching_player.get('EDAD', ''),
-                    'points': int(matching_player['PUNTOS']) if pd.notna(matching_player['PUNTOS']) else 0,
-                    'minutes': float(matching_player['MINUTOS JUGADOS']) if pd.notna(matching_player['MINUTOS JUGADOS']) else 0.0,
-                    'games_played': int(matching_player['PJ']) if pd.notna(matching_player['PJ']) else 0,
-                    'bio_url': matching_player.get('BIO_URL', ''),
-                    'photo_url': matching_player.get('FOTO_URL', '')
-                })
-            else:
-                # No se encontró en Excel, crear entrada básica
-                print(f"❌ NO MATCH: {image_filename} (buscó como '{image_base}') → creando entrada básica")
-                
-                image_base_clean = image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
-                
-                if '_' in image_base_clean:
-                    parts = image_base_clean.split('_')
-                    surnames = parts[0].replace('_', ' ')
-                    name = parts[1] if len(parts) > 1 else 'N'
-                else:
-                    surnames = image_base_clean
-                    name = 'N'
-                
-                # Crear slug único
-                slug = image_base_clean.lower()
-                
-                players_data.append({
-                    'number': 0,  # Sin dorsal
-                    'name': name,
-                    'surnames': surnames,
-                    'slug': slug,
-                    'full_name': f"{name} {surnames}",
-                    'team': team_name,
-                    'image_url': '',  # Vacío para usar imagen local
-                    'image_filename': image_filename,
-                    'image_path': str(image_path),  # Ruta local de la imagen
-                    'position': '',
-                    'height': '',
-                    'age': '',
-                    'points': 0,
-                    'minutes': 0.0,
-                    'games_played': 0,
-                    'bio_url': '',
-                    'photo_url': ''
-                })
-        
-        print(f"🏁 Procesamiento completado: {len(players_data)} jugadores cargados")
-        return players_data
+        # Lista compartida entre sesiones: solo se reconstruye si cambian las imágenes o el Excel
+        roster_key = get_roster_snapshot().key if EXCEL_FILE.exists() else ''
+        images = tuple(sorted((image_filename, str(image_path)) for image_filename, image_path in available_images.items()))
+        return list(_build_rival_players(team_name, images, roster_key))
         
     except Exception as e:
         st.error(f"❌ Error cargando jugadores de {team_name}: {str(e)}")
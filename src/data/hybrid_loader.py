@@ -17,8 +17,28 @@ from ..config import (
     USE_DRIVE_FIRST,
     TEAM_REPORT
 )
-from .drive_loader import get_drive_loader
+from .drive_loader import get_drive_loader, get_sync_coordinator
+from .cache_manager import get_cache_manager
+from ..utils.drive_governor import get_request_governor
 from .loader import load_players_dynamically as load_players_local
+from .player import Player
+
+
+def _find_cached_drive_image(drive_loader, player_slug: str) -> Optional[Path]:
+    """
+    Busca la imagen de un jugador en la cache de Drive: primero por nombre exacto
+    (búsqueda en el índice en memoria) y, si no, por coincidencia parcial del slug
+    """
+    slug = player_slug.lower()
+    image_path = drive_loader.get_cached_player_image(f"{slug}.png")
+    if image_path:
+        return image_path
+    
+    for image_name, image_path in drive_loader.get_cached_player_images().items():
+        if slug in image_name:
+            return image_path
+    
+    return None
 
 
 def _get_image_path_hybrid(player_slug: str) -> Optional[Path]:
@@ -35,10 +55,9 @@ def _get_image_path_hybrid(player_slug: str) -> Optional[Path]:
     
     # Método 1: Buscar en cache de Google Drive
     if USE_DRIVE_FIRST:
-        cached_images = drive_loader.get_cached_player_images()
-        for image_name, image_path in cached_images.items():
-            if player_slug.upper() in image_name.upper():
-                return image_path
+        image_path = _find_cached_drive_image(drive_loader, player_slug)
+        if image_path:
+            return image_path
     
     # Método 2: Buscar en archivos locales
     if PLAYER_PHOTOS_DIR.exists():
@@ -49,10 +68,7 @@ def _get_image_path_hybrid(player_slug: str) -> Optional[Path]:
     
     # Método 3: Si no se encontró y no priorizamos Drive, buscar en cache
     if not USE_DRIVE_FIRST:
-        cached_images = drive_loader.get_cached_player_images()
-        for image_name, image_path in cached_images.items():
-            if player_slug.upper() in image_name.upper():
-                return image_path
+        return _find_cached_drive_image(drive_loader, player_slug)
     
     return None
 
@@ -85,8 +101,8 @@ def get_team_report_path_hybrid() -> Optional[Path]:
     return None
 
 
-@st.cache_data
-def load_players_hybrid() -> List[Dict[str, Any]]:
+@st.cache_resource
+def load_players_hybrid() -> List[Player]:
     """
     Carga jugadores combinando Google Drive y archivos locales
     
@@ -99,26 +115,28 @@ def load_players_hybrid() -> List[Dict[str, Any]]:
     # Sincronización silenciosa (sin mostrar spinners)
     if drive_loader.drive_client and drive_loader.drive_client.is_authenticated():
         try:
-            # Descargar imágenes si no están en cache
-            drive_loader.download_player_images(force_refresh=False)
+            # Descargar imágenes si no están en cache (con el lock entre procesos del coordinador)
+            get_sync_coordinator().ensure_synced()
         except Exception:
             pass  # Fallar silenciosamente y continuar con archivos locales
     
     # Cargar jugadores usando el método local existente
     players = load_players_local()
     
-    # Actualizar rutas de imágenes con versiones híbridas
+    # Copias con las rutas de imágenes híbridas (los Player son inmutables y la
+    # lista de load_players_local es compartida por todas las sesiones)
+    hybrid_players = []
     for player in players:
-        player_slug = player.get('slug', '')
-        if player_slug:
-            hybrid_image_path = _get_image_path_hybrid(player_slug)
+        if player.slug:
+            hybrid_image_path = _get_image_path_hybrid(player.slug)
             if hybrid_image_path:
-                player['image_path'] = str(hybrid_image_path)
-                player['image_source'] = 'drive' if 'cache' in str(hybrid_image_path) else 'local'
+                source = 'drive' if 'cache' in str(hybrid_image_path) else 'local'
+                player = player.with_image(str(hybrid_image_path), source)
             else:
-                player['image_source'] = 'none'
+                player = player.with_image(player.image_path, 'none')
+        hybrid_players.append(player)
     
-    return players
+    return hybrid_players
 
 
 def sync_from_drive(force_refresh: bool = False) -> Dict[str, Any]:
@@ -142,8 +160,10 @@ def sync_from_drive(force_refresh: bool = False) -> Dict[str, Any]:
     # Limpiar cache de Streamlit para forzar recarga
     if force_refresh:
         st.cache_data.clear()
+        st.cache_resource.clear()
     
-    return drive_loader.sync_team_data(force_refresh)
+    # Sincronizar a través del coordinador para que el resultado lo vean todas las sesiones
+    return get_sync_coordinator().refresh(force_refresh=force_refresh)
 
 
 def get_drive_status() -> Dict[str, Any]:
@@ -160,12 +180,15 @@ def get_drive_status() -> Dict[str, Any]:
         'team_report_cached': False,
         'player_images_cached': 0,
         'cache_dir': str(drive_loader.cache_dir),
+        'api_stats': get_request_governor().stats(),
+        'cache_stats': get_cache_manager().stats(),
         'errors': []
     }
     
     try:
         if drive_loader.drive_client:
             status['authenticated'] = drive_loader.drive_client.is_authenticated()
+            status['transport_stats'] = drive_loader.drive_client.transport_stats()
         
         # Verificar archivos en cache
         cached_report = drive_loader.get_cached_team_report()
@@ -188,5 +211,6 @@ def clear_drive_cache() -> bool:
     # Limpiar cache de Streamlit también
     if success:
         st.cache_data.clear()
+        st.cache_resource.clear()
     
     return success
\ No newline at end of file
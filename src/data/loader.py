@@ -3,7 +3,7 @@
 """
 Módulo para carga dinámica de datos de jugadores
 """
-from typing import Dict, Any, List
+from typing import List, Optional
 import streamlit as st
 import pandas as pd
 
@@ -14,67 +14,39 @@ from ..config import (
     PLAYER_NAME_MAPPING,
     FALLBACK_PLAYERS
 )
+from .snapshot import load_roster
+from .player import Player, player_from_dict
+from ..utils.image_probe import get_image_probe
 
 
-import requests  # <-- arriba del archivo
 
-@st.cache_data(show_spinner=False, ttl=3600)
-def _probe_image_url(url: str) -> bool:
-    """
-    Devuelve True si la URL responde con una imagen real.
-    Hace un GET parcial (Range) y valida Content-Type + firma PNG/JPG/WEBP.
-    """
-    try:
-        if not url or not isinstance(url, str):
-            return False
-        url = url.strip()
-        if not url.startswith("http"):
-            return False
-
-        headers = {
-            "Range": "bytes=0-1023",
-            "User-Agent": "Mozilla/5.0 Streamlit/1.0",
-            "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
-        }
-        r = requests.get(url, headers=headers, timeout=4, stream=True)
-        if r.status_code not in (200, 206):
-            return False
-
-        ctype = r.headers.get("Content-Type", "").lower()
-        if not ctype.startswith("image/"):
-            return False
-
-        chunk = next(r.iter_content(1024), b"")
-        if not chunk:
-            return False
-
-        is_png = chunk.startswith(b"\x89PNG\r\n\x1a\n")
-        is_jpg = chunk.startswith(b"\xff\xd8\xff")
-        is_webp = chunk[:4] == b"RIFF" and b"WEBP" in chunk[:12]
-        return bool(is_png or is_jpg or is_webp)
-    except Exception:
-        return False
+def _validate_image_url(url):
+    """Devuelve la URL solo si el servicio de validación confirma que es una imagen; si no, None."""
+    return url if get_image_probe().probe(url) else None
 
 
-def _validate_image_url(url):
-    """Devuelve la URL solo si _probe_image_url confirma que es una imagen; si no, None."""
-    return url if _probe_image_url(url) else None
 
+def _fallback_players() -> List[Player]:
+    return [player_from_dict(p) for p in FALLBACK_PLAYERS]
 
 
-@st.cache_data
-def load_players_dynamically() -> List[Dict[str, Any]]:
+# cache_resource: los Player son inmutables, así que se comparten sin copiar en cada acceso
+@st.cache_resource
+def load_players_dynamically() -> List[Player]:
     """Carga jugadores dinámicamente desde PNG y Excel con lógica mejorada"""
     players = []
     
     try:
         # Leer Excel
         if not EXCEL_FILE.exists():
-            return FALLBACK_PLAYERS
+            return _fallback_players()
         
-        df = pd.read_excel(EXCEL_FILE)
+        df = load_roster()
         team_df = df[df['EQUIPO'].str.contains(TEAM_NAME_DISPLAY, case=False, na=False)]
         
+        # Validar en paralelo todas las URLs de imagen del equipo (resultados cacheados)
+        get_image_probe().probe_many(team_df['IMAGEN'].dropna().astype(str))
+        
         # Obtener archivos PNG disponibles
         png_files = []
         if PLAYER_PHOTOS_DIR.exists():
@@ -129,24 +101,23 @@ def load_players_dynamically() -> List[Dict[str, Any]]:
                 # Usar número del mapping o generar uno
                 fallback_number = PLAYER_NAME_MAPPING.get(png_file, (png_file, 99))[1]
                 
-                player = {
-                    "number": fallback_number,
-                    "name": png_file.split('_')[0].title(),
-                    "surnames": " ".join(png_file.split('_')[1:]).title(),
-                    "slug": png_file,
-                    "image_url": None
-                }
+                player = Player(
+                    number=fallback_number,
+                    name=png_file.split('_')[0].title(),
+                    surnames=" ".join(png_file.split('_')[1:]).title(),
+                    slug=png_file
+                )
                 players.append(player)
         
         # Ordenar por número
-        players.sort(key=lambda x: x['number'])
+        players.sort(key=lambda x: x.number)
         
     except Exception as e:
-        return FALLBACK_PLAYERS
+        return _fallback_players()
     
     return players
 
-def _create_player_from_excel_row(row, png_file):
+def _create_player_from_excel_row(row, png_file) -> Player:
     full_name = row['JUGADOR']
     player_number = int(row['DORSAL']) if pd.notna(row['DORSAL']) else 99
 
@@ -166,21 +137,21 @@ def _create_player_from_excel_row(row, png_file):
             name = full_name
             surnames = ""
 
-    return {
-        "number": player_number,
-        "name": name,
-        "surnames": surnames,
-        "slug": png_file,
-        "image_url": image_url  # <-- solo URL válida o None
-    }
+    return Player(
+        number=player_number,
+        name=name,
+        surnames=surnames,
+        slug=png_file,
+        image_url=image_url or ""  # <-- solo URL válida o ''
+    )
 
 
-def get_team_players() -> List[Dict[str, Any]]:
+def get_team_players() -> List[Player]:
     """Obtiene la lista de jugadores del equipo"""
     return load_players_dynamically()
 
 
-def find_player_by_slug(slug: str) -> Dict[str, Any]:
+def find_player_by_slug(slug: str) -> Optional[Player]:
     """Busca un jugador por su slug"""
     players = get_team_players()
-    return next((p for p in players if p["slug"] == slug), None)
\ No newline at end of file
+    return next((p for p in players if p.slug == slug), None)
\ No newline at end of file
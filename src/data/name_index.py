@@ -0,0 +1,160 @@
+# src/data/name_index.py
+# -*- coding: utf-8 -*-
+"""
+Índice de nombres normalizados del Excel de jugadores
+
+Relaciona los nombres de archivo de las imágenes de Drive (APELLIDOS_NOMBRE.png,
+APELLIDOS_INICIAL.png) con las filas del Excel mediante búsquedas en diccionario.
+Se construye una sola vez por snapshot del Excel.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .snapshot import get_roster_snapshot
+
+
+def split_roster_name(full_name: str) -> Tuple[str, str]:
+    """
+    Separa el nombre del Excel en (apellidos, nombre) con el formato de las tarjetas
+
+    Args:
+        full_name: Valor de la columna JUGADOR ("APELLIDOS, NOMBRE" o "I. APELLIDOS")
+
+    Returns:
+        Tupla (apellidos, nombre); para "APELLIDOS, NOMBRE" el nombre es la inicial
+    """
+    if ',' in full_name:
+        # Formato: "APELLIDOS, NOMBRE"
+        parts = full_name.split(',', 1)
+        surnames = parts[0].strip()
+        name = parts[1].strip() if len(parts) > 1 else ""
+        name = name.split()[0] if name else "N"
+        name = name[0] if name else "N"
+    else:
+        # Formato: "INICIAL. APELLIDOS"
+        name_parts = full_name.split(' ', 1) if full_name else ['', '']
+        if len(name_parts) >= 2:
+            first_part = name_parts[0].replace('.', '').strip()
+            surnames = name_parts[1]
+            name = first_part
+        else:
+            name = full_name[:1] if full_name else "N"
+            surnames = full_name[2:] if len(full_name) > 2 else "APELLIDOS"
+    return surnames, name
+
+
+def canonical_keys(full_name: str) -> Tuple[str, str, str]:
+    """
+    Claves canónicas de un jugador del Excel
+
+    Returns:
+        Tupla (APELLIDOS_NOMBRE, APELLIDOS_INICIAL, APELLIDOS)
+    """
+    surnames, name = split_roster_name(full_name)
+
+    surnames_normalized = surnames.upper().replace(' ', '_').replace('Ñ', 'N').replace(',', '')
+    name_normalized = name.upper().replace('Á', 'A').replace('É', 'E').replace('Í', 'I').replace('Ó', 'O').replace('Ú', 'U').replace('Ü', 'U')
+
+    expected_pattern = f"{surnames_normalized}_{name_normalized}"
+    expected_pattern_initial = f"{surnames_normalized}_{name_normalized[0]}" if len(name_normalized) > 1 else expected_pattern
+    return expected_pattern, expected_pattern_initial, surnames_normalized
+
+
+def image_base_name(image_filename: str) -> str:
+    """Nombre de archivo de imagen sin extensión y en mayúsculas"""
+    return image_filename.replace('.png', '').replace('.jpg', '').replace('.jpeg', '').upper()
+
+
+class _KeyTable:
+    """Tablas clave -> filas (en orden del Excel) para un subconjunto de jugadores"""
+
+    def __init__(self):
+        self.exact: Dict[str, List[int]] = {}
+        self.prefix: Dict[str, List[int]] = {}
+
+    def add(self, row_id: int, keys: Tuple[str, str, str]):
+        expected_pattern, expected_pattern_initial, surnames_normalized = keys
+        self.exact.setdefault(expected_pattern, []).append(row_id)
+        if expected_pattern_initial != expected_pattern:
+            self.exact.setdefault(expected_pattern_initial, []).append(row_id)
+        self.prefix.setdefault(surnames_normalized, []).append(row_id)
+
+    def candidates(self, image_base: str) -> Iterable[int]:
+        """Filas cuyo patrón coincide con el nombre de la imagen"""
+        yield from self.exact.get(image_base, ())
+        # image_base.startswith(APELLIDOS + '_') equivale a buscar cada prefijo hasta un '_'
+        pos = image_base.find('_')
+        while pos != -1:
+            yield from self.prefix.get(image_base[:pos], ())
+            pos = image_base.find('_', pos + 1)
+
+
+class RosterNameIndex:
+    """Índice de claves canónicas de nombre -> ids de fila del Excel"""
+
+    def __init__(self, df: pd.DataFrame):
+        self._league = _KeyTable()
+        self._teams: Dict[str, _KeyTable] = {}
+        self._team_rows: Dict[str, List[int]] = {}
+        self._name_parts: Dict[int, Tuple[str, str]] = {}
+
+        names = df['JUGADOR'] if 'JUGADOR' in df.columns else pd.Series(index=df.index, dtype=object)
+        teams = df['EQUIPO'] if 'EQUIPO' in df.columns else pd.Series(index=df.index, dtype=object)
+
+        for row_id, full_name, team in zip(df.index, names, teams):
+            team_key = _team_key(team)
+            if team_key:
+                self._team_rows.setdefault(team_key, []).append(row_id)
+
+            if not isinstance(full_name, str) or not full_name:
+                continue
+
+            keys = canonical_keys(full_name)
+            self._name_parts[row_id] = split_roster_name(full_name)
+            self._league.add(row_id, keys)
+            if team_key:
+                self._teams.setdefault(team_key, _KeyTable()).add(row_id, keys)
+
+    def team_rows(self, team_name: str) -> List[int]:
+        """Ids de fila de un equipo (comparación sin distinguir mayúsculas)"""
+        return self._team_rows.get(_team_key(team_name), [])
+
+    def name_parts(self, row_id: int) -> Tuple[str, str]:
+        """(apellidos, nombre) ya separados para una fila"""
+        return self._name_parts[row_id]
+
+    def match(self, image_filename: str, team_name: Optional[str] = None,
+              used: Optional[Set[int]] = None) -> Optional[int]:
+        """
+        Busca la fila del Excel que corresponde a una imagen
+
+        Args:
+            image_filename: Nombre del archivo (APELLIDOS_NOMBRE.png o APELLIDOS_INICIAL.png)
+            team_name: Restringir la búsqueda a un equipo (None = toda la liga)
+            used: Ids de fila ya asignados a otras imágenes
+
+        Returns:
+            Id de fila de la primera coincidencia en orden del Excel, o None
+        """
+        table = self._league if team_name is None else self._teams.get(_team_key(team_name))
+        if table is None:
+            return None
+
+        used = used or set()
+        best = None
+        for row_id in table.candidates(image_base_name(image_filename)):
+            if row_id in used:
+                continue
+            if best is None or row_id < best:
+                best = row_id
+        return best
+
+
+def _team_key(team: object) -> str:
+    return team.strip().upper() if isinstance(team, str) else ""
+
+
+def get_name_index() -> RosterNameIndex:
+    """Obtiene el índice de nombres del snapshot actual del Excel"""
+    return get_roster_snapshot().derived('name_index', RosterNameIndex)
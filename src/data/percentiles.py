@@ -0,0 +1,106 @@
+# src/data/percentiles.py
+# -*- coding: utf-8 -*-
+"""
+Percentiles de liga precalculados por estadística
+
+Para cada estadística derivada ordena a todos los jugadores del Excel (toda la
+liga y dentro de su FASE) con operaciones de ranking vectorizadas. El resultado
+se guarda en dos matrices uint8 (fila x estadística), de modo que consultar los
+percentiles de un jugador es solo indexar por su id de fila.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import PERCENTILE_MIN_MINUTES
+from .snapshot import get_roster_snapshot
+from .derived_stats import DerivedStats
+
+
+# Estadísticas con percentil: (columna, etiqueta, mayor_es_mejor)
+RANKED_STATS: List[Tuple[str, str, bool]] = [
+    ('ppg', 'PTS/P', True),
+    ('mpg', 'MIN/P', True),
+    ('rpg', 'REB/P', True),
+    ('apg', 'AST/P', True),
+    ('spg', 'REC/P', True),
+    ('topg', 'PER/P', False),
+    ('pts_per36', 'PTS/36', True),
+    ('efg_pct', 'eFG%', True),
+    ('ts_pct', 'TS%', True),
+    ('fg3_pct', 'T3%', True),
+    ('ft_pct', 'TL%', True),
+    ('usage_pct', 'USG%', True),
+    ('ast_to', 'AST/PER', True),
+]
+
+# Valor de la matriz para jugadores sin percentil (pocos minutos o sin denominador)
+MISSING = 255
+
+
+def _to_percentiles(ranks: pd.DataFrame) -> np.ndarray:
+    """Rangos en (0, 1] -> matriz uint8 0-100 con MISSING en los huecos"""
+    values = ranks.to_numpy(dtype=np.float64) * 100
+    return np.where(np.isnan(values), MISSING, np.rint(values)).astype(np.uint8)
+
+
+class PercentileTable:
+    """Percentiles de cada jugador en la liga y en su FASE"""
+
+    def __init__(self, stats: pd.DataFrame, df: pd.DataFrame, min_minutes: float = PERCENTILE_MIN_MINUTES):
+        self.stats = [name for name, _, _ in RANKED_STATS]
+        self.labels = {name: label for name, label, _ in RANKED_STATS}
+        self._columns = {name: i for i, name in enumerate(self.stats)}
+        self._positions = {row_id: i for i, row_id in enumerate(stats.index)}
+
+        # Solo se comparan jugadores con minutos suficientes
+        eligible = stats['minutes'] >= min_minutes
+        values = stats[self.stats].where(eligible, axis=0)
+        ascending = [higher for _, _, higher in RANKED_STATS]
+
+        # Invertir las estadísticas en las que menos es mejor para ordenar todas igual
+        signed = values * np.where(ascending, 1.0, -1.0)
+        self.league = _to_percentiles(signed.rank(pct=True))
+
+        phases = df['FASE'] if 'FASE' in df.columns else pd.Series('', index=df.index)
+        self.phase = _to_percentiles(signed.groupby(phases, sort=False, observed=True).rank(pct=True))
+        self.phase_names = phases.astype(object).to_numpy()
+        self.league_size = int(eligible.sum())
+
+    def row(self, row_id: Any) -> Dict[str, Dict[str, Optional[int]]]:
+        """
+        Percentiles de un jugador
+
+        Args:
+            row_id: Id de fila del Excel
+
+        Returns:
+            {estadística: {'label', 'league', 'phase'}}; None donde no hay percentil.
+            Vacío si la fila no existe
+        """
+        position = self._positions.get(row_id)
+        if position is None:
+            return {}
+        league, phase = self.league[position], self.phase[position]
+        return {
+            name: {
+                'label': self.labels[name],
+                'league': None if league[i] == MISSING else int(league[i]),
+                'phase': None if phase[i] == MISSING else int(phase[i]),
+            }
+            for name, i in self._columns.items()
+        }
+
+    def phase_of(self, row_id: Any) -> str:
+        """FASE de un jugador (grupo con el que se compara)"""
+        position = self._positions.get(row_id)
+        return "" if position is None else str(self.phase_names[position])
+
+
+def get_percentile_table() -> PercentileTable:
+    """Obtiene la tabla de percentiles del snapshot actual del Excel"""
+    snapshot = get_roster_snapshot()
+    # Fuera del builder: derived() no es reentrante
+    stats = snapshot.derived('derived_stats', DerivedStats)
+    return snapshot.derived('percentiles', lambda df: PercentileTable(stats.frame, df))
@@ -0,0 +1,75 @@
+# src/data/player.py
+# -*- coding: utf-8 -*-
+"""
+Registro de jugador compartido por todos los cargadores y vistas
+
+Sustituye a los diccionarios con claves distintas según el cargador: todos los
+jugadores tienen los mismos campos (con valores por defecto cuando no hay
+datos), ocupan menos memoria gracias a __slots__ y son inmutables, de modo que
+las listas cacheadas se comparten entre sesiones (st.cache_resource) sin copiarlas
+y sin que una vista pueda modificar los jugadores de otra.
+"""
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Player:
+    """Jugador de un equipo (datos del Excel + archivos de Drive)"""
+    number: int = 0
+    name: str = ""
+    surnames: str = ""
+    slug: str = ""
+    full_name: str = ""
+    team: str = ""
+    # URL de la foto (columna IMAGEN del Excel); '' si no hay una válida
+    image_url: str = ""
+    image_filename: str = ""
+    image_path: str = ""
+    image_source: str = ""
+    position: str = ""
+    height: str = ""
+    age: str = ""
+    bio_url: str = ""
+    photo_url: str = ""
+    # Totales de temporada y estadísticas derivadas (ver derived_stats.py)
+    points: int = 0
+    minutes: float = 0.0
+    games_played: int = 0
+    row_id: Optional[int] = None
+    # Vista de solo lectura de la tabla de estadísticas del snapshot (fuera del hash: no es hashable)
+    stats: Mapping[str, float] = field(default_factory=dict, hash=False)
+
+    def __post_init__(self):
+        if not isinstance(self.stats, MappingProxyType):
+            object.__setattr__(self, 'stats', MappingProxyType(self.stats))
+
+    def __getstate__(self):
+        # MappingProxyType no se puede serializar con pickle
+        return {name: getattr(self, name) for name in self.__dataclass_fields__} | {'stats': dict(self.stats)}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        self.__post_init__()
+
+    def with_image(self, image_path: str, image_source: str) -> "Player":
+        """Copia del jugador con otra imagen local"""
+        return replace(self, image_path=image_path, image_source=image_source)
+
+
+def player_from_dict(data: Dict[str, Any]) -> Player:
+    """
+    Crea un Player a partir de un diccionario (p. ej. FALLBACK_PLAYERS de config)
+
+    Args:
+        data: Diccionario con algunos de los campos de Player (las claves desconocidas se ignoran)
+
+    Returns:
+        Player con los valores por defecto en los campos ausentes
+    """
+    values = {key: value for key, value in data.items() if key in Player.__dataclass_fields__}
+    if values.get('image_url') is None:
+        values.pop('image_url', None)
+    return Player(**values)
@@ -0,0 +1,117 @@
+# src/data/schema.py
+# -*- coding: utf-8 -*-
+"""
+Esquema de tipos del Excel de jugadores
+
+pd.read_excel deja casi todo como object/int64/float64. Aquí se declara el tipo
+de cada columna (categorías para EQUIPO/FASE/NACIONALIDAD, enteros pequeños
+para las estadísticas de conteo, fechas para FECHA NACIMIENTO) y se elimina la
+columna duplicada JUGADOR.1. Se aplica una vez al crear el snapshot, que guarda
+los tipos en el Parquet.
+"""
+import re
+from typing import Any, Dict
+
+import pandas as pd
+
+
+# Cambiar al modificar el esquema: invalida los snapshots guardados con el anterior
+ROSTER_SCHEMA_VERSION = 1
+
+# Columnas con pocos valores distintos que se repiten en muchas filas
+CATEGORY_COLUMNS = ['EQUIPO', 'FASE', 'NACIONALIDAD']
+
+# Estadísticas de conteo (totales de temporada): caben en int16
+COUNT_COLUMNS = [
+    'DORSAL', 'PJ', 'PUNTOS',
+    'T2 CONVERTIDO', 'T2 INTENTADO', 'T3 CONVERTIDO', 'T3 INTENTADO',
+    'TL CONVERTIDOS', 'TL INTENTADOS', 'REB OFFENSIVO', 'REB DEFENSIVO',
+    'ASISTENCIAS', 'RECUPEROS', 'PERDIDAS', 'FaltasCOMETIDAS', 'FaltasRECIBIDAS',
+]
+
+FLOAT_COLUMNS = ['MINUTOS JUGADOS']
+
+DATE_COLUMNS = ['FECHA NACIMIENTO']
+
+# Columnas de nombre: espacios repetidos y espacios antes de la coma ("APELLIDOS , NOMBRE")
+NAME_COLUMNS = ['JUGADOR']
+
+_DUPLICATE_SUFFIX = re.compile(r"^(.*)\.(\d+)$")
+
+
+def _normalize_names(series: pd.Series) -> pd.Series:
+    """Normaliza los espacios de una columna de nombres (los valores no texto no cambian)"""
+    text = series.where(series.map(lambda value: isinstance(value, str)))
+    normalized = (text.str.replace(r"\s+", " ", regex=True)
+                      .str.replace(" ,", ",", regex=False)
+                      .str.strip())
+    return normalized.where(normalized.notna(), series)
+
+
+def _drop_duplicate_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Elimina las columnas que pandas renombra como 'COLUMNA.1' por un encabezado
+    repetido cuando su contenido coincide con la original (salvo espacios)
+    """
+    duplicates = []
+    for column in df.columns:
+        match = _DUPLICATE_SUFFIX.match(str(column))
+        if not match or match.group(1) not in df.columns:
+            continue
+        original = _normalize_names(df[match.group(1)].astype(object))
+        copy = _normalize_names(df[column].astype(object))
+        if original.equals(copy):
+            duplicates.append(column)
+    return df.drop(columns=duplicates)
+
+
+def _to_count(series: pd.Series) -> pd.Series:
+    """Entero de 16 bits (nullable si hay celdas vacías)"""
+    numeric = pd.to_numeric(series, errors='coerce')
+    if numeric.isna().any():
+        return numeric.round().astype('Int16')
+    return numeric.round().astype('int16')
+
+
+def apply_roster_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica el esquema declarado al DataFrame leído del Excel
+
+    Args:
+        df: DataFrame tal como lo devuelve pd.read_excel
+
+    Returns:
+        Nuevo DataFrame con columnas tipadas (las columnas desconocidas no cambian)
+    """
+    df = _drop_duplicate_columns(df)
+    columns: Dict[str, Any] = {}
+
+    for column in NAME_COLUMNS:
+        if column in df.columns:
+            columns[column] = _normalize_names(df[column])
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            columns[column] = df[column].astype('category')
+    for column in COUNT_COLUMNS:
+        if column in df.columns:
+            columns[column] = _to_count(df[column])
+    for column in FLOAT_COLUMNS:
+        if column in df.columns:
+            columns[column] = pd.to_numeric(df[column], errors='coerce')
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            # Fechas españolas (dd/mm/aaaa); las celdas ya leídas como fecha se mantienen
+            columns[column] = pd.to_datetime(df[column], dayfirst=True, errors='coerce')
+
+    return df.assign(**columns)
+
+
+def row_text(row: pd.Series, column: str) -> str:
+    """
+    Valor de texto de una fila ('' si la columna no existe o la celda está vacía).
+    Sustituye a row.fillna(""), que no funciona con columnas categóricas o numéricas.
+    """
+    value = row.get(column)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    return str(value)
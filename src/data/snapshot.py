@@ -0,0 +1,202 @@
+# src/data/snapshot.py
+# -*- coding: utf-8 -*-
+"""
+Snapshot columnar (Parquet) del Excel de jugadores
+
+Parsear data/jugadores.xlsx con openpyxl es el paso más lento de una carga en
+frío. Este módulo convierte el Excel una sola vez a Parquet y lo reutiliza
+mientras el archivo de origen no cambie (tamaño + mtime + hash SHA-256).
+Las columnas se tipan con el esquema de schema.py antes de guardar el Parquet.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from ..config import EXCEL_FILE, ROSTER_SNAPSHOT_DIR
+from .schema import apply_roster_schema, ROSTER_SCHEMA_VERSION
+
+
+_META_FILE = "snapshot.json"
+
+
+class RosterSnapshot:
+    """Snapshot inmutable del Excel de jugadores"""
+
+    def __init__(self, key: str, df: pd.DataFrame, source: Path):
+        self.key = key
+        self.df = df
+        self.source = source
+        # Artefactos derivados (índices, estadísticas...) calculados una vez por snapshot
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, name: str, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        Devuelve un artefacto derivado del snapshot, construyéndolo la primera vez
+
+        Args:
+            name: Nombre del artefacto
+            builder: Función que recibe el DataFrame y construye el artefacto
+
+        Returns:
+            El artefacto (compartido, no debe modificarse)
+        """
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = builder(self.df)
+            return self._derived[name]
+
+
+_snapshot_lock = threading.Lock()
+_current_snapshot: Optional[RosterSnapshot] = None
+_current_stat: Optional[Tuple[int, int]] = None
+
+
+def _hash_file(path: Path) -> str:
+    """Calcula el SHA-256 de un archivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_meta() -> Dict[str, Any]:
+    """Lee los metadatos del último snapshot generado"""
+    try:
+        with open(ROSTER_SNAPSHOT_DIR / _META_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _temp_path(target: Path) -> Path:
+    """Archivo temporal único junto a target (varios procesos pueden escribir a la vez)"""
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix='.tmp')
+    os.close(fd)
+    return Path(tmp_name)
+
+
+def _write_meta(meta: Dict[str, Any]) -> None:
+    """Escribe los metadatos del snapshot de forma atómica"""
+    meta_path = ROSTER_SNAPSHOT_DIR / _META_FILE
+    tmp_path = _temp_path(meta_path)
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _snapshot_path(key: str) -> Path:
+    # La versión del esquema forma parte del nombre: un esquema nuevo regenera el snapshot
+    return ROSTER_SNAPSHOT_DIR / f"roster-{key}-s{ROSTER_SCHEMA_VERSION}.parquet"
+
+
+def _build_snapshot(source: Path, key: str) -> pd.DataFrame:
+    """Parsea el Excel, aplica el esquema de tipos y guarda el resultado en Parquet"""
+    df = apply_roster_schema(pd.read_excel(source))
+
+    try:
+        ROSTER_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        target = _snapshot_path(key)
+        tmp_path = _temp_path(target)
+        try:
+            df.to_parquet(tmp_path, index=True)
+            os.replace(tmp_path, target)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        # Eliminar snapshots de versiones anteriores del Excel
+        for old in ROSTER_SNAPSHOT_DIR.glob("roster-*.parquet"):
+            if old != target:
+                old.unlink(missing_ok=True)
+    except Exception:
+        # Sin snapshot en disco seguimos funcionando con el DataFrame en memoria
+        pass
+
+    return df
+
+
+def _load_snapshot(source: Path, stat_key: Tuple[int, int]) -> RosterSnapshot:
+    """Carga el snapshot en disco o lo regenera si el Excel cambió"""
+    size, mtime_ns = stat_key
+    meta = _read_meta()
+
+    # Camino rápido: mismo tamaño y mtime que la última vez, no hace falta hashear
+    if meta.get('size') == size and meta.get('mtime_ns') == mtime_ns:
+        key = meta.get('key', '')
+    else:
+        key = _hash_file(source)[:16]
+
+    snapshot_file = _snapshot_path(key) if key else None
+    df = None
+    if snapshot_file and snapshot_file.exists():
+        try:
+            df = pd.read_parquet(snapshot_file)
+        except Exception:
+            df = None
+
+    if df is None:
+        if not key:
+            key = _hash_file(source)[:16]
+        df = _build_snapshot(source, key)
+
+    if meta.get('key') != key or meta.get('size') != size or meta.get('mtime_ns') != mtime_ns:
+        try:
+            ROSTER_SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+            _write_meta({'key': key, 'size': size, 'mtime_ns': mtime_ns})
+        except OSError:
+            pass
+
+    return RosterSnapshot(key, df, source)
+
+
+def get_roster_snapshot(source: Path = EXCEL_FILE) -> RosterSnapshot:
+    """
+    Obtiene el snapshot actual del Excel de jugadores
+
+    Args:
+        source: Ruta al Excel (por defecto EXCEL_FILE)
+
+    Returns:
+        RosterSnapshot vigente para el contenido actual del Excel
+
+    Raises:
+        FileNotFoundError: Si el Excel no existe
+    """
+    global _current_snapshot, _current_stat
+
+    stat = source.stat()
+    stat_key = (stat.st_size, stat.st_mtime_ns)
+
+    with _snapshot_lock:
+        if (_current_snapshot is not None and _current_stat == stat_key
+                and _current_snapshot.source == source):
+            return _current_snapshot
+
+        snapshot = _load_snapshot(source, stat_key)
+        _current_snapshot = snapshot
+        _current_stat = stat_key
+        return snapshot
+
+
+def load_roster(source: Path = EXCEL_FILE) -> pd.DataFrame:
+    """
+    Devuelve el DataFrame del Excel de jugadores desde el snapshot columnar.
+    Sustituye a pd.read_excel(EXCEL_FILE): el DataFrame es compartido, no modificar in-place.
+
+    Args:
+        source: Ruta al Excel (por defecto EXCEL_FILE)
+
+    Returns:
+        DataFrame con todas las filas del Excel
+    """
+    return get_roster_snapshot(source).df
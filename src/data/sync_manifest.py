@@ -0,0 +1,190 @@
+# src/data/sync_manifest.py
+# -*- coding: utf-8 -*-
+"""
+Manifest local de sincronización con Google Drive
+
+Cada equipo en cache guarda un .manifest.json con los archivos descargados
+(file_id -> md5/modifiedTime/ruta local) y la hora de la última sincronización
+de cada carpeta. Así una resincronización solo descarga lo nuevo o modificado.
+"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..config import CACHE_EXPIRY_HOURS
+
+
+MANIFEST_FILE = ".manifest.json"
+
+
+class SyncManifest:
+    """Manifest de sincronización de la carpeta de cache de un equipo"""
+
+    def __init__(self, team_dir: Path):
+        self.team_dir = Path(team_dir)
+        self.path = self.team_dir / MANIFEST_FILE
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.scopes: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        """Carga el manifest desde disco (vacío si no existe o está corrupto)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.files = data.get('files', {})
+            self.scopes = data.get('scopes', {})
+        except (OSError, ValueError, AttributeError):
+            self.files = {}
+            self.scopes = {}
+
+    def save(self):
+        """Guarda el manifest de forma atómica"""
+        try:
+            self.team_dir.mkdir(parents=True, exist_ok=True)
+            # Temporal único: otro proceso o hilo puede estar guardando el mismo manifest
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.team_dir,
+                                             prefix=f"{MANIFEST_FILE}.", suffix='.tmp',
+                                             delete=False) as f:
+                json.dump({'files': self.files, 'scopes': self.scopes}, f, indent=1)
+            try:
+                os.replace(f.name, self.path)
+            finally:
+                Path(f.name).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _relative(self, local_path: Path) -> str:
+        try:
+            return Path(local_path).relative_to(self.team_dir).as_posix()
+        except ValueError:
+            return Path(local_path).as_posix()
+
+    def _absolute(self, relative_path: str) -> Path:
+        return self.team_dir / relative_path
+
+    def is_current(self, drive_file: Dict[str, Any], local_path: Path) -> bool:
+        """
+        Indica si la copia local corresponde a la versión actual del archivo en Drive
+
+        Args:
+            drive_file: Diccionario del listado de Drive (id, md5Checksum, modifiedTime)
+            local_path: Ruta local esperada para el archivo
+
+        Returns:
+            True si no hace falta descargarlo
+        """
+        entry = self.files.get(drive_file.get('id'))
+        if not entry or entry.get('path') != self._relative(local_path):
+            return False
+        if not local_path.exists():
+            return False
+
+        md5 = drive_file.get('md5Checksum')
+        if md5:
+            return entry.get('md5') == md5
+        return entry.get('modified_time') == drive_file.get('modifiedTime')
+
+    def record(self, scope: str, drive_file: Dict[str, Any], local_path: Path) -> Optional[Path]:
+        """
+        Registra un archivo descargado
+
+        Returns:
+            Copia local anterior eliminada si el archivo cambió de nombre en Drive (None si no)
+        """
+        previous = self.files.get(drive_file['id'])
+        stale_path = None
+        if previous and previous.get('path') != self._relative(local_path):
+            # Renombrado: la copia con el nombre anterior aparecería como otro archivo
+            # (salvo que ese nombre sea ya el de otro archivo, p. ej. dos nombres intercambiados)
+            in_use = any(entry.get('path') == previous['path']
+                         for file_id, entry in self.files.items() if file_id != drive_file['id'])
+            if not in_use:
+                stale_path = self._absolute(previous['path'])
+                stale_path.unlink(missing_ok=True)
+        self.files[drive_file['id']] = {
+            'scope': scope,
+            'name': drive_file.get('name', ''),
+            'md5': drive_file.get('md5Checksum'),
+            'modified_time': drive_file.get('modifiedTime'),
+            'path': self._relative(local_path)
+        }
+        return stale_path
+
+    def path_of(self, file_id: str) -> Optional[Path]:
+        """Ruta local registrada para un archivo"""
+        entry = self.files.get(file_id)
+        return self._absolute(entry['path']) if entry else None
+
+    def forget(self, file_id: str, delete_local: bool = True) -> Optional[Path]:
+        """Elimina un archivo del manifest (y su copia local)"""
+        entry = self.files.pop(file_id, None)
+        if not entry:
+            return None
+        local_path = self._absolute(entry['path'])
+        if delete_local:
+            local_path.unlink(missing_ok=True)
+        return local_path
+
+    def prune(self, scope: str, keep_ids: Iterable[str]):
+        """Elimina las entradas de una carpeta que ya no existen en Drive"""
+        keep_ids = set(keep_ids)
+        for file_id in [fid for fid, entry in self.files.items()
+                        if entry.get('scope') == scope and fid not in keep_ids]:
+            self.forget(file_id)
+
+    def configure_scope(self, scope: str, folder_id: Optional[str], target_dir: Path,
+                        lowercase: bool = False, local_name: Optional[str] = None):
+        """
+        Registra la carpeta de Drive asociada a una carpeta lógica y cómo se nombran sus archivos
+
+        Args:
+            scope: Carpeta lógica dentro del equipo ('informe', 'jugadores')
+            folder_id: ID de la carpeta en Drive
+            target_dir: Carpeta local de destino
+            lowercase: Guardar los archivos con el nombre en minúsculas
+            local_name: Nombre local fijo (carpetas con un único archivo)
+        """
+        info = self.scopes.setdefault(scope, {})
+        info.update({
+            'folder_id': folder_id,
+            'dir': self._relative(target_dir),
+            'lowercase': lowercase,
+            'local_name': local_name
+        })
+
+    def local_path_for(self, scope: str, drive_name: str) -> Path:
+        """Ruta local que corresponde a un archivo de Drive según la configuración de su carpeta"""
+        info = self.scopes.get(scope, {})
+        name = info.get('local_name') or (drive_name.lower() if info.get('lowercase') else drive_name)
+        return self._absolute(info.get('dir', '.')) / name
+
+    def scope_for_folder(self, folder_id: str) -> Optional[str]:
+        """Carpeta lógica asociada a un ID de carpeta de Drive"""
+        for scope, info in self.scopes.items():
+            if info.get('folder_id') == folder_id:
+                return scope
+        return None
+
+    def mark_synced(self, scope: str):
+        """Anota la hora de sincronización de una carpeta"""
+        self.scopes.setdefault(scope, {})['synced_at'] = time.time()
+
+    def is_fresh(self, scope: str) -> bool:
+        """Indica si la carpeta se sincronizó hace menos de CACHE_EXPIRY_HOURS"""
+        synced_at = self.scopes.get(scope, {}).get('synced_at', 0)
+        return (time.time() - synced_at) / 3600 < CACHE_EXPIRY_HOURS
+
+    def local_files(self, scope: str) -> Dict[str, Path]:
+        """Archivos locales registrados para una carpeta: {nombre_local: path}"""
+        result = {}
+        for entry in self.files.values():
+            if entry.get('scope') != scope:
+                continue
+            local_path = self._absolute(entry['path'])
+            if local_path.exists():
+                result[local_path.name] = local_path
+        return result
@@ -0,0 +1,148 @@
+# src/utils/catalog_store.py
+# -*- coding: utf-8 -*-
+"""
+Catálogo persistente (SQLite) del árbol de Google Drive
+
+Guarda los IDs de las carpetas de equipo y de jugadores y los metadatos de
+sus archivos, para que un arranque en frío o un render resuelvan carpetas sin
+ninguna llamada a Drive. El catálogo se revalida en segundo plano cuando caduca.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..config import DRIVE_CATALOG_DB
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    root_folder_id TEXT PRIMARY KEY,
+    built_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS folders (
+    root_folder_id TEXT NOT NULL,
+    folder_id TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    PRIMARY KEY (root_folder_id, folder_id)
+);
+CREATE TABLE IF NOT EXISTS files (
+    root_folder_id TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mime_type TEXT,
+    size TEXT,
+    modified_time TEXT,
+    md5 TEXT
+);
+CREATE INDEX IF NOT EXISTS files_by_parent ON files (root_folder_id, parent_id, position);
+"""
+
+# Columna SQLite -> campo de la API de Drive
+_FILE_COLUMNS = (
+    ('mime_type', 'mimeType'),
+    ('size', 'size'),
+    ('modified_time', 'modifiedTime'),
+    ('md5', 'md5Checksum'),
+)
+
+
+class DriveCatalogStore:
+    """Lectura y escritura del catálogo de Drive en SQLite"""
+
+    def __init__(self, db_path: Path = DRIVE_CATALOG_DB):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.db_path), timeout=30)
+        if not self._initialized:
+            connection.executescript(_SCHEMA)
+            self._initialized = True
+        return connection
+
+    def load(self, root_folder_id: str) -> Optional[Tuple[Dict[str, List[Dict[str, Any]]], Set[str], float]]:
+        """
+        Carga el último catálogo guardado
+
+        Args:
+            root_folder_id: ID de la carpeta raíz
+
+        Returns:
+            Tupla (hijos por carpeta, carpetas incompletas, hora del recorrido) o None
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                try:
+                    row = connection.execute(
+                        "SELECT built_at FROM catalog WHERE root_folder_id = ?", (root_folder_id,)
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    built_at = row[0]
+
+                    children: Dict[str, List[Dict[str, Any]]] = {}
+                    incomplete: Set[str] = set()
+                    for folder_id, complete in connection.execute(
+                            "SELECT folder_id, complete FROM folders WHERE root_folder_id = ?", (root_folder_id,)):
+                        children[folder_id] = []
+                        if not complete:
+                            incomplete.add(folder_id)
+
+                    for parent_id, file_id, name, *values in connection.execute(
+                            "SELECT parent_id, id, name, mime_type, size, modified_time, md5 FROM files "
+                            "WHERE root_folder_id = ? ORDER BY parent_id, position", (root_folder_id,)):
+                        drive_file = {'id': file_id, 'name': name, 'parents': [parent_id]}
+                        for (_, field), value in zip(_FILE_COLUMNS, values):
+                            if value is not None:
+                                drive_file[field] = value
+                        children.setdefault(parent_id, []).append(drive_file)
+                finally:
+                    connection.close()
+            return children, incomplete, built_at
+        except sqlite3.Error:
+            return None
+
+    def save(self, root_folder_id: str, children: Dict[str, List[Dict[str, Any]]],
+             incomplete: Set[str], built_at: float) -> bool:
+        """
+        Sustituye el catálogo guardado por un recorrido nuevo (en una sola transacción)
+
+        Returns:
+            True si se guardó
+        """
+        try:
+            with self._lock:
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute("DELETE FROM files WHERE root_folder_id = ?", (root_folder_id,))
+                        connection.execute("DELETE FROM folders WHERE root_folder_id = ?", (root_folder_id,))
+                        connection.execute(
+                            "INSERT OR REPLACE INTO catalog (root_folder_id, built_at) VALUES (?, ?)",
+                            (root_folder_id, built_at)
+                        )
+                        connection.executemany(
+                            "INSERT INTO folders (root_folder_id, folder_id, complete) VALUES (?, ?, ?)",
+                            [(root_folder_id, folder_id, int(folder_id not in incomplete)) for folder_id in children]
+                        )
+                        connection.executemany(
+                            "INSERT INTO files (root_folder_id, parent_id, position, id, name, mime_type, "
+                            "size, modified_time, md5) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            [
+                                (root_folder_id, parent_id, position, f['id'], f.get('name', ''),
+                                 *(f.get(field) for _, field in _FILE_COLUMNS))
+                                for parent_id, files in children.items()
+                                for position, f in enumerate(files)
+                            ]
+                        )
+                finally:
+                    connection.close()
+            return True
+        except sqlite3.Error:
+            return False
@@ -0,0 +1,231 @@
+# src/utils/drive_governor.py
+# -*- coding: utf-8 -*-
+"""
+Regulador compartido de peticiones a la API de Google Drive
+
+Clasifica los errores (cuota, servidor, red, permanentes), reintenta los
+transitorios con espera exponencial con jitter y ajusta la concurrencia con
+AIMD: sube poco a poco con cada éxito y se reduce a la mitad cuando Drive
+responde que se ha superado la cuota. Expone contadores para diagnóstico.
+"""
+import random
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..config import (
+    DRIVE_MAX_CONCURRENCY,
+    DRIVE_MAX_RETRIES,
+    DRIVE_BACKOFF_BASE_SECONDS,
+    DRIVE_BACKOFF_MAX_SECONDS
+)
+
+try:
+    from googleapiclient.errors import HttpError
+except ImportError:
+    HttpError = None
+
+
+# Tipos de error
+RATE_LIMIT = 'rate_limit'
+SERVER = 'server'
+NETWORK = 'network'
+NOT_FOUND = 'not_found'
+AUTH = 'auth'
+CLIENT = 'client'
+
+_RETRYABLE = {RATE_LIMIT, SERVER, NETWORK}
+_RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded', 'dailyLimitExceeded'}
+
+
+class DriveRequestError(Exception):
+    """Error de una petición a Drive ya clasificado (tras agotar los reintentos si era transitorio)"""
+
+    def __init__(self, kind: str, message: str = "", status: Optional[int] = None):
+        super().__init__(message or kind)
+        self.kind = kind
+        self.status = status
+
+    @property
+    def retryable(self) -> bool:
+        return self.kind in _RETRYABLE
+
+
+def classify_status(status: int, reason: str = "") -> str:
+    """Tipo de error para un código HTTP de Drive"""
+    if status == 429 or (status == 403 and reason in _RATE_LIMIT_REASONS):
+        return RATE_LIMIT
+    if status >= 500:
+        return SERVER
+    if status == 404:
+        return NOT_FOUND
+    if status in (401, 403):
+        return AUTH
+    return CLIENT
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Clasifica una excepción de una llamada a Drive
+
+    Returns:
+        RATE_LIMIT, SERVER, NETWORK, NOT_FOUND, AUTH o CLIENT
+    """
+    if isinstance(error, DriveRequestError):
+        return error.kind
+
+    if HttpError is not None and isinstance(error, HttpError):
+        status = int(getattr(error.resp, 'status', 0) or 0)
+        reason = ""
+        try:
+            reason = error.error_details[0].get('reason', '') if error.error_details else ""
+        except (AttributeError, IndexError, TypeError):
+            pass
+        return classify_status(status, reason)
+
+    if isinstance(error, (socket.timeout, TimeoutError, ConnectionError)):
+        return NETWORK
+    # httplib2 y ssl lanzan subclases de OSError para fallos de conexión
+    if isinstance(error, OSError) or type(error).__name__ in ('ServerNotFoundError', 'RedirectLimit'):
+        return NETWORK
+    return CLIENT
+
+
+class RequestGovernor:
+    """Limita la concurrencia (AIMD) y reintenta las peticiones transitorias a Drive"""
+
+    def __init__(self, max_concurrency: int = DRIVE_MAX_CONCURRENCY,
+                 max_retries: int = DRIVE_MAX_RETRIES,
+                 base_delay: float = DRIVE_BACKOFF_BASE_SECONDS,
+                 max_delay: float = DRIVE_BACKOFF_MAX_SECONDS):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._condition = threading.Condition()
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._counters: Dict[str, int] = {
+            'requests': 0,
+            'successes': 0,
+            'retries': 0,
+            'failures': 0,
+            RATE_LIMIT: 0,
+            SERVER: 0,
+            NETWORK: 0,
+            NOT_FOUND: 0,
+            AUTH: 0,
+            CLIENT: 0,
+        }
+
+    # ----- Concurrencia (AIMD) -----
+
+    def _acquire(self):
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+            self._counters['requests'] += 1
+
+    def _release(self, kind: Optional[str]):
+        with self._condition:
+            self._in_flight -= 1
+            if kind is None:
+                # Aumento aditivo: +1 de concurrencia por cada "ventana" de éxitos
+                self._counters['successes'] += 1
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+            else:
+                self._counters[kind] += 1
+                if kind == RATE_LIMIT:
+                    # Disminución multiplicativa ante respuestas de cuota
+                    self._limit = max(1.0, self._limit / 2)
+            self._condition.notify_all()
+
+    def backoff(self, attempt: int) -> float:
+        """Espera exponencial con jitter completo para el intento dado (0, 1, 2...)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def record(self, error: Optional[BaseException]) -> Tuple[str, bool]:
+        """
+        Registra el resultado de una petición ejecutada fuera de execute()
+        (por ejemplo, cada respuesta de un lote HTTP)
+
+        Returns:
+            Tupla (tipo_de_error, reintentable); ('', False) si no hubo error
+        """
+        kind = classify_error(error) if error is not None else None
+        with self._condition:
+            self._counters['requests'] += 1
+            if kind is None:
+                self._counters['successes'] += 1
+                self._limit = min(self.max_concurrency, self._limit + 1.0 / self._limit)
+                return '', False
+            self._counters[kind] += 1
+            if kind == RATE_LIMIT:
+                self._limit = max(1.0, self._limit / 2)
+        return kind, kind in _RETRYABLE
+
+    def execute(self, call: Callable[[], Any], description: str = "petición a Drive") -> Any:
+        """
+        Ejecuta una llamada a Drive respetando el límite de concurrencia y
+        reintentando los errores transitorios
+
+        Args:
+            call: Función sin argumentos que hace la petición
+            description: Texto para el mensaje de error
+
+        Returns:
+            El resultado de call()
+
+        Raises:
+            DriveRequestError: Si el error es permanente o se agotan los reintentos
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                result = call()
+            except Exception as e:
+                kind = classify_error(e)
+                self._release(kind)
+                if kind not in _RETRYABLE or attempt >= self.max_retries:
+                    with self._condition:
+                        self._counters['failures'] += 1
+                    status = getattr(e, 'status', None)
+                    if status is None and getattr(e, 'resp', None) is not None:
+                        status = getattr(e.resp, 'status', None)
+                    raise DriveRequestError(kind, f"{description}: {e}", status) from e
+
+                with self._condition:
+                    self._counters['retries'] += 1
+                time.sleep(self.backoff(attempt))
+                attempt += 1
+                continue
+
+            self._release(None)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de peticiones, errores por tipo y concurrencia actual"""
+        with self._condition:
+            stats = dict(self._counters)
+            stats['concurrency_limit'] = int(self._limit)
+            stats['in_flight'] = self._in_flight
+        return stats
+
+
+# Regulador global (compartido por todos los hilos del proceso)
+_request_governor = None
+_request_governor_lock = threading.Lock()
+
+def get_request_governor() -> RequestGovernor:
+    """Obtiene el regulador global de peticiones a Drive"""
+    global _request_governor
+
+    with _request_governor_lock:
+        if _request_governor is None:
+            _request_governor = RequestGovernor()
+
+    return _request_governor
@@ -0,0 +1,113 @@
+# src/utils/drive_transport.py
+# -*- coding: utf-8 -*-
+"""
+Transporte HTTP thread-safe para la API de Google Drive
+
+googleapiclient usa por defecto httplib2, que no es thread-safe: un servicio
+compartido entre sesiones de Streamlit obliga a serializar las llamadas. Aquí
+se mantiene un pool de AuthorizedSession (requests, con conexiones keep-alive)
+y un adaptador con la interfaz de httplib2 que toma una sesión del pool en cada
+petición y la devuelve al terminar. Así un único servicio de Drive se puede
+usar desde cualquier hilo y las peticiones concurrentes van en paralelo.
+"""
+import queue
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import DRIVE_MAX_CONCURRENCY, DRIVE_HTTP_TIMEOUT_SECONDS
+
+try:
+    from google.auth.transport.requests import AuthorizedSession
+    from requests.adapters import HTTPAdapter
+    import httplib2
+    TRANSPORT_AVAILABLE = True
+except ImportError:
+    TRANSPORT_AVAILABLE = False
+
+
+class AuthorizedSessionPool:
+    """Pool acotado de sesiones autorizadas, creadas bajo demanda y reutilizadas"""
+
+    def __init__(self, credentials, size: int = DRIVE_MAX_CONCURRENCY):
+        self.credentials = credentials
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[AuthorizedSession]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _new_session(self) -> "AuthorizedSession":
+        session = AuthorizedSession(self.credentials)
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def acquire(self) -> "AuthorizedSession":
+        """Toma una sesión libre (la más reciente, con la conexión más probablemente viva)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if create:
+            return self._new_session()
+
+        # Pool agotado: esperar a que otro hilo devuelva una sesión
+        return self._idle.get()
+
+    def release(self, session: "AuthorizedSession"):
+        """Devuelve una sesión al pool"""
+        self._idle.put(session)
+
+    def stats(self) -> Dict[str, int]:
+        """Sesiones creadas y libres"""
+        return {'sessions': self._created, 'idle': self._idle.qsize()}
+
+
+class PooledHttp:
+    """
+    Adaptador con la interfaz de httplib2.Http que usa AuthorizedSessionPool
+
+    googleapiclient solo llama a request(); las respuestas se devuelven como
+    httplib2.Response para que el resto de la librería (lotes, descargas) no cambie.
+    """
+
+    def __init__(self, pool: AuthorizedSessionPool, timeout: float = DRIVE_HTTP_TIMEOUT_SECONDS):
+        self.pool = pool
+        self.timeout = timeout
+        # BatchHttpRequest firma cada subpetición con estas credenciales
+        self.credentials = pool.credentials
+
+    def request(self, uri: str, method: str = "GET", body: Any = None,
+                headers: Optional[Dict[str, str]] = None, redirections: int = 5,
+                connection_type: Any = None) -> Tuple["httplib2.Response", bytes]:
+        """
+        Ejecuta una petición con una sesión del pool
+
+        Returns:
+            Tupla (respuesta con status y cabeceras en minúsculas, contenido)
+        """
+        session = self.pool.acquire()
+        try:
+            response = session.request(method, uri, data=body, headers=headers,
+                                       allow_redirects=redirections > 0, timeout=self.timeout)
+            content = response.content
+        finally:
+            self.pool.release(session)
+
+        info = {key.lower(): value for key, value in response.headers.items()}
+        # requests ya ha descomprimido el contenido (como httplib2)
+        if 'content-encoding' in info:
+            info['-content-encoding'] = info.pop('content-encoding')
+            info['content-length'] = str(len(content))
+        info['status'] = str(response.status_code)
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, content
+
+    def close(self):
+        """Compatibilidad con httplib2.Http (las sesiones pertenecen al pool)"""
@@ -0,0 +1,111 @@
+# src/utils/file_lock.py
+# -*- coding: utf-8 -*-
+"""
+Lock de archivo entre procesos (réplicas / workers del servidor)
+
+Usa flock en POSIX y msvcrt.locking en Windows. El lock es reentrante dentro
+del mismo hilo y serializa también los hilos del propio proceso.
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+
+    def _lock_fd(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_fd(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+except ImportError:
+    import msvcrt
+
+    def _lock_fd(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock_fd(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+_POLL_INTERVAL = 0.1
+
+
+class FileLock:
+    """Lock exclusivo basado en un archivo, compartido por todos los procesos"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Adquiere el lock
+
+        Args:
+            blocking: Esperar si otro proceso/hilo lo tiene
+            timeout: Segundos máximos de espera (None = sin límite)
+
+        Returns:
+            True si se adquirió el lock
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not blocking:
+            acquired = self._thread_lock.acquire(False)
+        else:
+            acquired = self._thread_lock.acquire(timeout=-1 if timeout is None else timeout)
+        if not acquired:
+            return False
+
+        if self._depth == 0:
+            try:
+                acquired = self._acquire_file(blocking, deadline)
+            except Exception:
+                self._thread_lock.release()
+                raise
+            if not acquired:
+                self._thread_lock.release()
+                return False
+
+        self._depth += 1
+        return True
+
+    def _acquire_file(self, blocking: bool, deadline: Optional[float]) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        while True:
+            try:
+                _lock_fd(fd)
+                self._fd = fd
+                return True
+            except OSError:
+                if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                    os.close(fd)
+                    return False
+                time.sleep(_POLL_INTERVAL)
+
+    def release(self):
+        """Libera el lock (debe llamarse desde el hilo que lo adquirió)"""
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                _unlock_fd(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -5,29 +5,173 @@ Cliente de Google Drive para descargar archivos de scouting
 """
 import os
 import json
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple, Set
 import streamlit as st
 
+from ..config import (
+    DRIVE_DOWNLOAD_WORKERS,
+    DRIVE_DOWNLOAD_CHUNK_SIZE,
+    DRIVE_CATALOG_TTL_MINUTES,
+    DRIVE_DISCOVERY_CACHE_FILE,
+    DRIVE_TOKEN_REFRESH_MARGIN_SECONDS,
+    GOOGLE_DRIVE_ROOT_FOLDER_ID
+)
+from .catalog_store import DriveCatalogStore
+from .drive_governor import get_request_governor, classify_status, DriveRequestError
+from .drive_transport import AuthorizedSessionPool, PooledHttp
+from .single_flight import SingleFlight
+
 try:
     from google.auth.transport.requests import Request
     from google.oauth2 import service_account
-    from googleapiclient.discovery import build
-    from googleapiclient.http import MediaIoBaseDownload
-    import io
+    from googleapiclient.discovery import build, build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
     GOOGLE_DRIVE_AVAILABLE = True
 except ImportError:
     GOOGLE_DRIVE_AVAILABLE = False
 
 
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Campos mínimos de los listados (los que usan las descargas, el manifest y el catálogo)
+_FILE_FIELDS = "nextPageToken, files(id, name, mimeType, modifiedTime, md5Checksum)"
+_FOLDER_FIELDS = "nextPageToken, files(id, name, mimeType)"
+_LIST_PAGE_SIZE = 1000
+
+# Máximo de peticiones por lote HTTP de la API de Drive
+_BATCH_LIMIT = 100
+
+# Niveles a recorrer: raíz -> carpetas de equipo -> subcarpetas (jugadores)
+_CRAWL_DEPTH = 3
+
+
+def _matches_type(drive_file: Dict[str, Any], file_type: Optional[str]) -> bool:
+    """Mismo filtro que las consultas de list_files_in_folder, aplicado en memoria"""
+    mime_type = drive_file.get('mimeType')
+    if mime_type == FOLDER_MIME_TYPE:
+        return False
+    if not file_type:
+        return True
+    if file_type.lower() == 'pdf':
+        return mime_type == 'application/pdf'
+    if file_type.lower() in ['png', 'jpg', 'jpeg']:
+        return mime_type in ('image/png', 'image/jpeg')
+    return True
+
+
+class DriveCatalog:
+    """
+    Copia en memoria del árbol de carpetas bajo la raíz de Drive
+    (equipos, carpetas de jugadores, PDFs e imágenes)
+    """
+    
+    def __init__(self, root_folder_id: str, children: Dict[str, List[Dict[str, Any]]],
+                 incomplete: Set[str], built_at: Optional[float] = None):
+        self.root_folder_id = root_folder_id
+        self.built_at = time.time() if built_at is None else built_at
+        self.children = children
+        # Carpetas cuyo listado falló o quedó a medias: se consultan directamente
+        self.incomplete = incomplete
+    
+    def covers(self, folder_id: str) -> bool:
+        """Indica si el catálogo tiene el listado completo de una carpeta"""
+        return folder_id in self.children and folder_id not in self.incomplete
+    
+    def folders(self, folder_id: str) -> List[Dict[str, Any]]:
+        """Subcarpetas de una carpeta"""
+        return [dict(f) for f in self.children.get(folder_id, []) if f.get('mimeType') == FOLDER_MIME_TYPE]
+    
+    def files(self, folder_id: str, file_type: str = None) -> List[Dict[str, Any]]:
+        """Archivos de una carpeta, con el mismo filtro por tipo que list_files_in_folder"""
+        return [dict(f) for f in self.children.get(folder_id, []) if _matches_type(f, file_type)]
+    
+    def find_folder(self, parent_id: str, names: Iterable[str]) -> Optional[str]:
+        """ID de la subcarpeta cuyo nombre coincide (sin distinguir mayúsculas) con alguno de names"""
+        wanted = {name.upper() for name in names}
+        for folder in self.folders(parent_id):
+            if folder['name'].upper() in wanted:
+                return folder['id']
+        return None
+
+
+_discovery_document: Optional[Dict[str, Any]] = None
+_discovery_lock = threading.Lock()
+
+
+def _get_discovery_document() -> Dict[str, Any]:
+    """
+    Documento de descubrimiento de Drive v3, parseado una sola vez por proceso y
+    guardado en DRIVE_DISCOVERY_CACHE_FILE (construir servicios no requiere red)
+    """
+    global _discovery_document
+    
+    with _discovery_lock:
+        if _discovery_document is not None:
+            return _discovery_document
+        
+        document = None
+        try:
+            with open(DRIVE_DISCOVERY_CACHE_FILE, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        if document is None:
+            raw = get_static_doc('drive', 'v3')
+            if raw is None:
+                # Versión de la librería sin documentos incluidos: descargarlo una vez
+                raw = json.dumps(build('drive', 'v3', static_discovery=False, cache_discovery=False)._rootDesc)
+            document = json.loads(raw)
+            try:
+                DRIVE_DISCOVERY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = DRIVE_DISCOVERY_CACHE_FILE.with_suffix('.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(document, f)
+                os.replace(tmp_path, DRIVE_DISCOVERY_CACHE_FILE)
+            except OSError:
+                pass
+        
+        _discovery_document = document
+        return document
+
+
+def _md5_of(path: Path) -> str:
+    """md5 de un archivo local (mismo formato que md5Checksum de Drive)"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 class GoogleDriveClient:
     """Cliente para interactuar con Google Drive API"""
     
     def __init__(self, credentials_path: str = "credentials/google_drive_credentials.json"):
         self.credentials_path = Path(credentials_path)
-        self.service = None
+        self._service = None
+        self._service_lock = threading.Lock()
+        self._credentials = None
+        self._session_pool: Optional[AuthorizedSessionPool] = None
         self._authenticated = False
         
+        # Regulador compartido: reintentos, backoff y concurrencia adaptativa
+        self._governor = get_request_governor()
+        
+        # Catálogo en memoria del árbol de la raíz, respaldado en SQLite (ver get_catalog)
+        self._catalog: Optional[DriveCatalog] = None
+        self._catalog_lock = threading.Lock()
+        self._catalog_store = DriveCatalogStore()
+        self._catalog_refreshing = False
+        # Un solo recorrido del árbol a la vez (los demás llamantes esperan su resultado)
+        self._catalog_flights = SingleFlight()
+        
         if not GOOGLE_DRIVE_AVAILABLE:
             return
             
@@ -65,21 +209,133 @@ class GoogleDriveClient:
             if credentials is None:
                 return
             
-            # Construir el servicio
-            self.service = build('drive', 'v3', credentials=credentials)
-            
-            # Verificar que funciona
-            about = self.service.about().get(fields="user").execute()
-            user_email = about.get('user', {}).get('emailAddress', 'Usuario')
-            
+            # Sin llamada de verificación: el servicio se construye en el primer uso y
+            # unas credenciales inválidas aparecen como error de autenticación en esa llamada
+            self._credentials = credentials
+            self._session_pool = AuthorizedSessionPool(credentials)
             self._authenticated = True
             
+            # Obtener el token en segundo plano mientras se pinta la primera página
+            threading.Thread(target=self._refresh_token_loop, name="drive-token", daemon=True).start()
+            
         except Exception as e:
             self._authenticated = False
     
+    def _refresh_token_loop(self):
+        """
+        Mantiene vigente el token de acceso: lo renueva DRIVE_TOKEN_REFRESH_MARGIN_SECONDS
+        antes de que caduque, para que ninguna petición tenga que esperar a la renovación
+        """
+        while True:
+            credentials = self._credentials
+            expiry = getattr(credentials, 'expiry', None)
+            if credentials.valid and expiry is not None:
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                wait = (expiry - now).total_seconds() - DRIVE_TOKEN_REFRESH_MARGIN_SECONDS
+                if wait > 0:
+                    time.sleep(wait)
+                    continue
+            
+            try:
+                credentials.refresh(Request())
+            except Exception:
+                # Sin red: reintentar más tarde (las peticiones renuevan el token si hace falta)
+                time.sleep(60)
+    
+    @property
+    def service(self):
+        """
+        Servicio de Drive compartido por todos los hilos (se construye en el primer
+        uso, sin llamadas de red). Cada petición toma una sesión HTTP del pool, así
+        que las sesiones de Streamlit pueden llamar a Drive en paralelo.
+        """
+        if self._service is None and self._session_pool is not None:
+            with self._service_lock:
+                if self._service is None:
+                    self._service = build_from_document(_get_discovery_document(),
+                                                        http=PooledHttp(self._session_pool))
+        return self._service
+    
+    def transport_stats(self) -> Dict[str, int]:
+        """Sesiones HTTP creadas y libres en el pool"""
+        return self._session_pool.stats() if self._session_pool is not None else {}
+    
     def is_authenticated(self) -> bool:
-        """Verifica si el cliente está autenticado"""
-        return self._authenticated and self.service is not None
+        """Verifica si el cliente tiene credenciales (no hace ninguna llamada a Drive)"""
+        return self._authenticated and self._credentials is not None
+    
+    def _iter_pages(self, query: str, fields: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Recorre las páginas de un files.list. Mientras el llamador procesa una
+        página, la siguiente ya se está pidiendo en otro hilo (con el servicio compartido,
+        que toma una sesión HTTP del pool para cada petición).
+        
+        Args:
+            query: Consulta q de files.list
+            fields: Máscara de campos (debe incluir nextPageToken)
+        
+        Yields:
+            Lista de archivos de cada página
+        
+        Raises:
+            DriveRequestError: Si una página falla tras los reintentos
+        """
+        if not self.is_authenticated():
+            return
+        
+        def _fetch(page_token: Optional[str]) -> Dict[str, Any]:
+            request = self.service.files().list(
+                q=query,
+                pageSize=_LIST_PAGE_SIZE,
+                pageToken=page_token,
+                fields=fields
+            )
+            return self._governor.execute(request.execute, "listado de Drive")
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="drive-list") as prefetcher:
+            future = prefetcher.submit(_fetch, None)
+            while future is not None:
+                response = future.result()
+                page_token = response.get('nextPageToken')
+                future = prefetcher.submit(_fetch, page_token) if page_token else None
+                yield response.get('files', [])
+    
+    @staticmethod
+    def _files_query(folder_id: str, file_type: str = None) -> str:
+        """Consulta de archivos de una carpeta con filtro opcional por tipo"""
+        query = f"'{folder_id}' in parents and trashed=false"
+        if file_type:
+            if file_type.lower() == 'pdf':
+                query += " and mimeType='application/pdf'"
+            elif file_type.lower() in ['png', 'jpg', 'jpeg']:
+                query += " and (mimeType='image/png' or mimeType='image/jpeg')"
+        return query
+    
+    def iter_files_in_folder(self, folder_id: str, file_type: str = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lista archivos de una carpeta página a página (sin el límite de una sola página)
+        
+        Args:
+            folder_id: ID de la carpeta en Google Drive
+            file_type: Tipo de archivo a filtrar ('pdf', 'png', etc.)
+        
+        Yields:
+            Lista de archivos de cada página
+        """
+        return self._iter_pages(self._files_query(folder_id, file_type), _FILE_FIELDS)
+    
+    def iter_folders_in_folder(self, folder_id: str) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lista subcarpetas de una carpeta página a página
+        
+        Args:
+            folder_id: ID de la carpeta padre
+        
+        Yields:
+            Lista de carpetas de cada página
+        """
+        query = f"'{folder_id}' in parents and mimeType='{FOLDER_MIME_TYPE}' and trashed=false"
+        return self._iter_pages(query, _FOLDER_FIELDS)
     
     def list_files_in_folder(self, folder_id: str, file_type: str = None) -> List[Dict[str, Any]]:
         """
@@ -91,29 +347,11 @@ class GoogleDriveClient:
         
         Returns:
             Lista de diccionarios con información de archivos
-        """
-        if not self.is_authenticated():
-            return []
         
-        try:
-            # Construir query de búsqueda
-            query = f"'{folder_id}' in parents and trashed=false"
-            if file_type:
-                if file_type.lower() == 'pdf':
-                    query += " and mimeType='application/pdf'"
-                elif file_type.lower() in ['png', 'jpg', 'jpeg']:
-                    query += " and (mimeType='image/png' or mimeType='image/jpeg')"
-            
-            # Obtener lista de archivos
-            results = self.service.files().list(
-                q=query,
-                fields="files(id, name, mimeType, size, modifiedTime)"
-            ).execute()
-            
-            return results.get('files', [])
-            
-        except Exception as e:
-            return []
+        Raises:
+            DriveRequestError: Si Drive falla (un error no se confunde con una carpeta vacía)
+        """
+        return [f for page in self.iter_files_in_folder(folder_id, file_type) for f in page]
     
     def list_folders_in_folder(self, folder_id: str) -> List[Dict[str, Any]]:
         """
@@ -124,31 +362,236 @@ class GoogleDriveClient:
         
         Returns:
             Lista de diccionarios con información de carpetas
+        
+        Raises:
+            DriveRequestError: Si Drive falla (un error no se confunde con una carpeta vacía)
+        """
+        return [f for page in self.iter_folders_in_folder(folder_id) for f in page]
+    
+    def list_children_batched(self, folder_ids: Iterable[str],
+                              service=None) -> Tuple[Dict[str, List[Dict[str, Any]]], Set[str]]:
+        """
+        Lista el contenido completo de varias carpetas con lotes HTTP (hasta 100
+        files.list por petición), siguiendo nextPageToken en rondas sucesivas
+        
+        Args:
+            folder_ids: IDs de las carpetas a listar
+            service: Servicio de Drive a usar (por defecto el compartido)
+        
+        Returns:
+            Tupla ({folder_id: archivos y carpetas}, IDs de carpetas cuyo listado falló)
         """
+        children: Dict[str, List[Dict[str, Any]]] = {}
+        failed: Set[str] = set()
+        pending: Dict[str, Optional[str]] = {folder_id: None for folder_id in folder_ids}
+        
         if not self.is_authenticated():
-            return []
+            return children, set(pending)
         
-        try:
-            # Buscar solo carpetas
-            query = f"'{folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            
-            results = self.service.files().list(
-                q=query,
-                fields="files(id, name, modifiedTime)"
-            ).execute()
+        service = service or self.service
+        for folder_id in pending:
+            children[folder_id] = []
+        
+        next_pending: Dict[str, Optional[str]] = {}
+        attempts: Dict[str, int] = {}
+        
+        def _callback(request_id, response, exception):
+            kind, retryable = self._governor.record(exception)
+            if exception is not None:
+                # Errores transitorios (cuota, 5xx): repetir la misma página en la siguiente ronda
+                if retryable and attempts.get(request_id, 0) < self._governor.max_retries:
+                    attempts[request_id] = attempts.get(request_id, 0) + 1
+                    next_pending[request_id] = pending[request_id]
+                else:
+                    failed.add(request_id)
+                return
+            children[request_id].extend(response.get('files', []))
+            if response.get('nextPageToken'):
+                next_pending[request_id] = response['nextPageToken']
+        
+        while pending:
+            next_pending.clear()
+            items = list(pending.items())
             
-            return results.get('files', [])
+            for start in range(0, len(items), _BATCH_LIMIT):
+                batch = service.new_batch_http_request(callback=_callback)
+                for folder_id, page_token in items[start:start + _BATCH_LIMIT]:
+                    batch.add(service.files().list(
+                        q=f"'{folder_id}' in parents and trashed=false",
+                        pageSize=_LIST_PAGE_SIZE,
+                        pageToken=page_token,
+                        fields=_FILE_FIELDS
+                    ), request_id=folder_id)
+                
+                try:
+                    self._governor.execute(batch.execute, "lote de listados de Drive")
+                except DriveRequestError:
+                    failed.update(folder_id for folder_id, _ in items[start:start + _BATCH_LIMIT])
             
-        except Exception as e:
-            return []
+            retry_round = max((attempts.get(folder_id, 0) for folder_id in next_pending), default=0)
+            pending = {folder_id: token for folder_id, token in next_pending.items() if folder_id not in failed}
+            if pending and retry_round:
+                time.sleep(self._governor.backoff(retry_round - 1))
+        
+        return children, failed
     
-    def download_file(self, file_id: str, destination_path: Path) -> bool:
+    def crawl_tree(self, root_folder_id: str = GOOGLE_DRIVE_ROOT_FOLDER_ID,
+                   service=None) -> Optional[DriveCatalog]:
         """
-        Descarga un archivo de Google Drive
+        Recorre el árbol bajo la raíz nivel a nivel (una ronda de lotes por nivel)
+        y guarda el resultado en el catálogo persistente
+        
+        Args:
+            root_folder_id: ID de la carpeta raíz
+            service: Servicio de Drive a usar (por defecto el principal)
+        
+        Returns:
+            DriveCatalog o None si no se pudo listar la raíz
+        """
+        children: Dict[str, List[Dict[str, Any]]] = {}
+        incomplete: Set[str] = set()
+        level = [root_folder_id]
+        
+        for _ in range(_CRAWL_DEPTH):
+            if not level:
+                break
+            listed, failed = self.list_children_batched(level, service)
+            children.update(listed)
+            incomplete |= failed
+            level = [f['id'] for folder_id in level if folder_id not in failed
+                     for f in listed.get(folder_id, []) if f.get('mimeType') == FOLDER_MIME_TYPE]
+        
+        if root_folder_id in incomplete:
+            return None
+        
+        catalog = DriveCatalog(root_folder_id, children, incomplete)
+        self._catalog_store.save(root_folder_id, children, incomplete, catalog.built_at)
+        return catalog
+    
+    def _refresh_catalog(self) -> Optional[DriveCatalog]:
+        """
+        Recorre el árbol sin retener _catalog_lock y sustituye el catálogo en memoria
+        
+        Returns:
+            El catálogo actual (el anterior si el recorrido falló)
+        """
+        crawled = self.crawl_tree(GOOGLE_DRIVE_ROOT_FOLDER_ID)
+        with self._catalog_lock:
+            # No sustituir un catálogo más reciente (otro recorrido terminó antes)
+            if crawled is not None and (self._catalog is None or crawled.built_at >= self._catalog.built_at):
+                self._catalog = crawled
+            return self._catalog
+    
+    def get_catalog(self, max_age_seconds: float = DRIVE_CATALOG_TTL_MINUTES * 60) -> Optional[DriveCatalog]:
+        """
+        Catálogo del árbol de la raíz. En frío se carga del catálogo persistente sin
+        llamar a Drive; si es más antiguo que max_age_seconds se sirve igualmente y
+        se revalida en segundo plano. Con max_age_seconds=0 se recorre en el momento.
+        
+        Returns:
+            DriveCatalog o None si Drive no está disponible y no hay catálogo guardado
+        """
+        with self._catalog_lock:
+            if self._catalog is None:
+                stored = self._catalog_store.load(GOOGLE_DRIVE_ROOT_FOLDER_ID)
+                if stored is not None:
+                    children, incomplete, built_at = stored
+                    self._catalog = DriveCatalog(GOOGLE_DRIVE_ROOT_FOLDER_ID, children, incomplete, built_at)
+            catalog = self._catalog
+        
+        if catalog is None or max_age_seconds <= 0:
+            # Sin red: _refresh_catalog devuelve el último catálogo si lo hay
+            return self._catalog_flights.do('crawl', self._refresh_catalog)
+        
+        if time.time() - catalog.built_at >= max_age_seconds:
+            self._revalidate_catalog_in_background()
+        return catalog
+    
+    def catalog_is_fresh(self, folder_id: str,
+                         max_age_seconds: float = DRIVE_CATALOG_TTL_MINUTES * 60) -> bool:
+        """
+        Indica si el listado de una carpeta que devuelven catalog_files/catalog_iter_files
+        refleja Drive: se lista en el momento (carpeta no catalogada) o el catálogo no ha
+        caducado. Un catálogo cargado de SQLite puede tener cualquier antigüedad.
+        
+        Args:
+            folder_id: ID de la carpeta
+            max_age_seconds: Antigüedad máxima del catálogo
+        
+        Returns:
+            True si el listado puede tratarse como la carpeta completa actual
+        """
+        catalog = self.get_catalog(max_age_seconds)
+        if catalog is None or not catalog.covers(folder_id):
+            return True
+        return time.time() - catalog.built_at < max_age_seconds
+    
+    def _revalidate_catalog_in_background(self):
+        """Lanza (una sola vez a la vez) un recorrido del árbol en un hilo aparte"""
+        if self._catalog_refreshing:
+            return
+        self._catalog_refreshing = True
+        
+        def _revalidate():
+            try:
+                self._catalog_flights.do('crawl', self._refresh_catalog)
+            except Exception:
+                pass
+            finally:
+                self._catalog_refreshing = False
+        
+        threading.Thread(target=_revalidate, name="drive-catalog", daemon=True).start()
+    
+    def invalidate_catalog(self):
+        """Marca el catálogo como caducado (se revalidará en el siguiente uso)"""
+        with self._catalog_lock:
+            if self._catalog is not None:
+                self._catalog.built_at = 0.0
+    
+    def catalog_folders(self, folder_id: str) -> List[Dict[str, Any]]:
+        """Subcarpetas desde el catálogo (o listando la carpeta si no está catalogada)"""
+        catalog = self.get_catalog()
+        if catalog is not None and catalog.covers(folder_id):
+            return catalog.folders(folder_id)
+        return self.list_folders_in_folder(folder_id)
+    
+    def catalog_files(self, folder_id: str, file_type: str = None) -> List[Dict[str, Any]]:
+        """Archivos desde el catálogo (o listando la carpeta si no está catalogada)"""
+        catalog = self.get_catalog()
+        if catalog is not None and catalog.covers(folder_id):
+            return catalog.files(folder_id, file_type)
+        return self.list_files_in_folder(folder_id, file_type)
+    
+    def catalog_iter_files(self, folder_id: str, file_type: str = None) -> Iterator[Dict[str, Any]]:
+        """
+        Igual que catalog_files, pero si hay que listar en Drive devuelve los archivos
+        según llegan las páginas (las descargas pueden empezar con la primera)
+        """
+        catalog = self.get_catalog()
+        if catalog is not None and catalog.covers(folder_id):
+            yield from catalog.files(folder_id, file_type)
+            return
+        
+        for page in self.iter_files_in_folder(folder_id, file_type):
+            yield from page
+    
+    def download_file(self, file_id: str, destination_path: Path, service=None,
+                      expected_md5: Optional[str] = None,
+                      chunk_size: int = DRIVE_DOWNLOAD_CHUNK_SIZE) -> bool:
+        """
+        Descarga un archivo de Google Drive directamente a disco, por bloques.
+        
+        Los bloques se escriben en un archivo temporal (.part) en la misma carpeta,
+        que se sincroniza (fsync) y se renombra de forma atómica al terminar: los
+        lectores nunca ven un archivo a medias. Si una descarga anterior se
+        interrumpió, se reanuda desde el final del .part.
         
         Args:
             file_id: ID del archivo en Google Drive
             destination_path: Ruta local donde guardar el archivo
+            service: Servicio de Drive a usar (por defecto el compartido)
+            expected_md5: md5Checksum de Drive para validar el resultado
+            chunk_size: Tamaño de cada bloque en bytes
         
         Returns:
             True si la descarga fue exitosa, False en caso contrario
@@ -159,25 +602,117 @@ class GoogleDriveClient:
         try:
             # Crear directorio si no existe
             destination_path.parent.mkdir(parents=True, exist_ok=True)
+            part_path = destination_path.with_name(f".{destination_path.name}.{file_id}.part")
             
-            # Descargar archivo
-            request = self.service.files().get_media(fileId=file_id)
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
+            request = (service or self.service).files().get_media(fileId=file_id)
+            resumed = part_path.exists() and part_path.stat().st_size > 0
             
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
+            # Los reintentos reanudan desde lo ya escrito en el .part
+            self._governor.execute(lambda: self._download_to_part(request, part_path, chunk_size),
+                                   f"descarga de {file_id}")
             
-            # Escribir archivo a disco
-            with open(destination_path, 'wb') as f:
-                f.write(fh.getvalue())
+            # Un .part reanudado puede ser de una versión anterior: repetir desde cero
+            if expected_md5 and _md5_of(part_path) != expected_md5:
+                part_path.unlink(missing_ok=True)
+                if not resumed:
+                    return False
+                self._governor.execute(lambda: self._download_to_part(request, part_path, chunk_size),
+                                       f"descarga de {file_id}")
+                if _md5_of(part_path) != expected_md5:
+                    part_path.unlink(missing_ok=True)
+                    return False
             
+            os.replace(part_path, destination_path)
             return True
             
         except Exception as e:
             return False
     
+    @staticmethod
+    def _download_to_part(request, part_path: Path, chunk_size: int):
+        """
+        Descarga por rangos HTTP al archivo .part, continuando desde su tamaño actual
+        
+        Args:
+            request: Petición get_media de googleapiclient (aporta uri y transporte autorizado)
+            part_path: Archivo temporal de destino
+            chunk_size: Tamaño de cada bloque en bytes
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        
+        with open(part_path, 'ab') as fh:
+            while True:
+                headers = {'Range': f'bytes={offset}-{offset + chunk_size - 1}'}
+                resp, content = request.http.request(request.uri, method='GET', headers=headers)
+                
+                if resp.status == 416:
+                    # Rango fuera del archivo: el .part ya está completo (o el archivo está vacío)
+                    break
+                if resp.status not in (200, 206):
+                    raise DriveRequestError(classify_status(resp.status),
+                                            f"Error HTTP {resp.status} descargando {request.uri}", resp.status)
+                
+                if resp.status == 200:
+                    # El servidor ignoró el rango: viene el archivo entero
+                    fh.seek(0)
+                    fh.truncate()
+                    fh.write(content)
+                    break
+                
+                fh.write(content)
+                offset += len(content)
+                
+                # Content-Range: bytes inicio-fin/total
+                total = int(resp.get('content-range', '').rsplit('/', 1)[-1] or 0)
+                if not content or offset >= total:
+                    break
+            
+            fh.flush()
+            os.fsync(fh.fileno())
+    
+    def download_files(self, downloads: Iterable[Tuple],
+                       max_workers: int = DRIVE_DOWNLOAD_WORKERS) -> List[Dict[str, Any]]:
+        """
+        Descarga varios archivos en paralelo con un pool de hilos acotado
+        
+        Args:
+            downloads: Tuplas (file_id, ruta_destino) o (file_id, ruta_destino, md5Checksum).
+                       Puede ser un generador: cada descarga empieza en cuanto llega su tupla
+            max_workers: Número máximo de descargas simultáneas (1 = secuencial)
+        
+        Returns:
+            Lista con un diccionario por archivo: file_id, path, success, seconds, bytes
+        """
+        if not self.is_authenticated():
+            return []
+        
+        def _download(item: Tuple) -> Dict[str, Any]:
+            file_id, destination_path = item[0], item[1]
+            expected_md5 = item[2] if len(item) > 2 else None
+            started = time.perf_counter()
+            success = self.download_file(file_id, destination_path, expected_md5=expected_md5)
+            return {
+                'file_id': file_id,
+                'path': destination_path,
+                'success': success,
+                'seconds': time.perf_counter() - started,
+                'bytes': destination_path.stat().st_size if success else 0
+            }
+        
+        if isinstance(downloads, (list, tuple)):
+            if not downloads:
+                return []
+            workers = max(1, min(max_workers, len(downloads)))
+        else:
+            workers = max(1, max_workers)
+        
+        if workers == 1:
+            return [_download(item) for item in downloads]
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drive-download") as pool:
+            futures = [pool.submit(_download, item) for item in downloads]
+            return [future.result() for future in futures]
+    
     def find_team_folder(self, root_folder_id: str, team_name: str) -> Optional[str]:
         """
         Busca la carpeta de un equipo específico
@@ -189,7 +724,7 @@ class GoogleDriveClient:
         Returns:
             ID de la carpeta del equipo o None si no se encuentra
         """
-        folders = self.list_folders_in_folder(root_folder_id)
+        folders = self.catalog_folders(root_folder_id)
         
         for folder in folders:
             if folder['name'].upper() == team_name.upper():
@@ -211,15 +746,105 @@ class GoogleDriveClient:
             return None
         
         try:
-            file_info = self.service.files().get(
+            request = self.service.files().get(
                 fileId=file_id,
-                fields="id, name, mimeType, size, modifiedTime, parents"
-            ).execute()
+                fields="id, name, mimeType, size, modifiedTime, md5Checksum, parents"
+            )
+            file_info = self._governor.execute(request.execute, "metadatos de Drive")
             
             return file_info
             
         except Exception as e:
             return None
+    
+    def get_start_page_token(self) -> Optional[str]:
+        """
+        Obtiene el token inicial del feed de cambios (Changes API)
+        
+        Returns:
+            Token a partir del cual se registrarán los cambios o None si hay error
+        """
+        if not self.is_authenticated():
+            return None
+        
+        try:
+            response = self._governor.execute(self.service.changes().getStartPageToken().execute,
+                                              "token del feed de cambios")
+            return response.get('startPageToken')
+            
+        except Exception as e:
+            return None
+    
+    def list_changes(self, page_token: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Lista los cambios ocurridos desde un token del feed de cambios
+        
+        Args:
+            page_token: Token guardado en la sincronización anterior
+        
+        Returns:
+            Tupla (cambios, nuevo_token). nuevo_token es None si hubo un error
+        """
+        if not self.is_authenticated():
+            return [], None
+        
+        changes = []
+        try:
+            while page_token:
+                request = self.service.changes().list(
+                    pageToken=page_token,
+                    spaces='drive',
+                    includeRemoved=True,
+                    pageSize=1000,
+                    fields="nextPageToken, newStartPageToken, "
+                           "changes(fileId, removed, file(id, name, mimeType, md5Checksum, modifiedTime, parents, trashed))"
+                )
+                response = self._governor.execute(request.execute, "feed de cambios")
+                
+                changes.extend(response.get('changes', []))
+                if 'newStartPageToken' in response:
+                    return changes, response['newStartPageToken']
+                page_token = response.get('nextPageToken')
+            
+            return changes, None
+            
+        except Exception as e:
+            return [], None
+
+
+class LocalChangesFeed:
+    """
+    Implementación local del feed de cambios de Drive (getStartPageToken/list),
+    para probar la sincronización incremental sin conexión
+    """
+    
+    def __init__(self):
+        self._changes: List[Dict[str, Any]] = []
+    
+    def record(self, file: Dict[str, Any], removed: bool = False):
+        """
+        Registra un cambio en el feed
+        
+        Args:
+            file: Metadatos del archivo (id, name, mimeType, md5Checksum, modifiedTime, parents, trashed)
+            removed: True si el archivo se eliminó definitivamente
+        """
+        change = {'fileId': file['id'], 'removed': removed}
+        if not removed:
+            change['file'] = dict(file)
+        self._changes.append(change)
+    
+    def get_start_page_token(self) -> Optional[str]:
+        """Token que apunta al final actual del feed"""
+        return str(len(self._changes))
+    
+    def list_changes(self, page_token: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Cambios registrados desde el token dado y el nuevo token"""
+        try:
+            start = int(page_token)
+        except (TypeError, ValueError):
+            return [], None
+        return [dict(change) for change in self._changes[start:]], str(len(self._changes))
 
 
 # Instancia global del cliente (singleton)
@@ -0,0 +1,206 @@
+# src/utils/image_probe.py
+# -*- coding: utf-8 -*-
+"""
+Servicio de validación de URLs de imágenes (columna IMAGEN del Excel)
+
+Comprueba en paralelo que las URLs devuelven una imagen real, reutilizando
+conexiones keep-alive, y guarda los resultados (también los negativos) en
+disco con caducidad para que sobrevivan a reinicios del proceso. Los fallos
+transitorios (timeouts, errores de conexión, 5xx, 429) no son un negativo:
+solo se recuerdan en memoria durante IMAGE_PROBE_ERROR_TTL_SECONDS.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config import (
+    IMAGE_PROBE_CACHE_FILE,
+    IMAGE_PROBE_TTL_HOURS,
+    IMAGE_PROBE_NEGATIVE_TTL_HOURS,
+    IMAGE_PROBE_ERROR_TTL_SECONDS,
+    IMAGE_PROBE_MAX_WORKERS,
+    IMAGE_PROBE_TIMEOUT
+)
+
+
+_PROBE_HEADERS = {
+    "Range": "bytes=0-1023",
+    "User-Agent": "Mozilla/5.0 Streamlit/1.0",
+    "Accept": "image/avif,image/webp,image/apng,image/*,*/*;q=0.8",
+}
+
+# Respuestas 4xx que no dicen nada de la URL (reintentar más tarde)
+_TRANSIENT_STATUS = {408, 425, 429}
+
+
+class ImageProbeService:
+    """Valida URLs de imágenes de forma concurrente con cache persistente"""
+
+    def __init__(self, cache_path: Path = IMAGE_PROBE_CACHE_FILE,
+                 max_workers: int = IMAGE_PROBE_MAX_WORKERS,
+                 timeout: float = IMAGE_PROBE_TIMEOUT):
+        self.cache_path = Path(cache_path)
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.ttl_seconds = IMAGE_PROBE_TTL_HOURS * 3600
+        self.negative_ttl_seconds = IMAGE_PROBE_NEGATIVE_TTL_HOURS * 3600
+
+        # Sesión compartida con pool de conexiones del tamaño del pool de hilos
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update(_PROBE_HEADERS)
+
+        self._lock = threading.Lock()
+        self._results: Optional[Dict[str, Tuple[bool, float]]] = None
+        # Fallos transitorios: url -> hora del fallo (solo en memoria)
+        self._errors: Dict[str, float] = {}
+
+    def _load(self) -> Dict[str, Tuple[bool, float]]:
+        """Carga los resultados persistidos (una sola vez por proceso)"""
+        if self._results is None:
+            results = {}
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    for url, (ok, checked_at) in json.load(f).items():
+                        results[url] = (bool(ok), float(checked_at))
+            except (OSError, ValueError, TypeError):
+                pass
+            self._results = results
+        return self._results
+
+    def _save(self) -> None:
+        """Guarda los resultados en disco de forma atómica"""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Temporal único: otros procesos pueden estar guardando a la vez
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_path.parent,
+                                             prefix=f".{self.cache_path.name}.", suffix='.tmp',
+                                             delete=False) as f:
+                json.dump({url: [ok, checked_at] for url, (ok, checked_at) in self._results.items()}, f)
+            try:
+                os.replace(f.name, self.cache_path)
+            finally:
+                Path(f.name).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _is_fresh(self, ok: bool, checked_at: float, now: float) -> bool:
+        ttl = self.ttl_seconds if ok else self.negative_ttl_seconds
+        return now - checked_at < ttl
+
+    def _fetch(self, url: str) -> Optional[bool]:
+        """
+        Hace un GET parcial (Range) y valida Content-Type + firma PNG/JPG/WEBP.
+
+        Returns:
+            True/False si la respuesta es definitiva; None si falló la red o el servidor
+        """
+        try:
+            with self._session.get(url, timeout=self.timeout, stream=True) as r:
+                if r.status_code >= 500 or r.status_code in _TRANSIENT_STATUS:
+                    return None
+                if r.status_code not in (200, 206):
+                    return False
+
+                ctype = r.headers.get("Content-Type", "").lower()
+                if not ctype.startswith("image/"):
+                    return False
+
+                chunk = next(r.iter_content(1024), b"")
+                if not chunk:
+                    return False
+
+                is_png = chunk.startswith(b"\x89PNG\r\n\x1a\n")
+                is_jpg = chunk.startswith(b"\xff\xd8\xff")
+                is_webp = chunk[:4] == b"RIFF" and b"WEBP" in chunk[:12]
+                return bool(is_png or is_jpg or is_webp)
+        except requests.RequestException:
+            return None
+        except Exception:
+            return False
+
+    def probe_many(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """
+        Valida un conjunto de URLs en paralelo
+
+        Args:
+            urls: URLs a comprobar (se ignoran valores vacíos o no http)
+
+        Returns:
+            Diccionario {url: es_imagen} para cada URL recibida
+        """
+        urls = list(urls)
+        results: Dict[str, bool] = {}
+        pending = []
+        now = time.time()
+
+        with self._lock:
+            cached = self._load()
+            for url in urls:
+                if not url or not isinstance(url, str):
+                    continue
+                key = url.strip()
+                if not key.startswith("http"):
+                    results[url] = False
+                    continue
+                entry = cached.get(key)
+                if entry and self._is_fresh(entry[0], entry[1], now):
+                    results[url] = entry[0]
+                elif now - self._errors.get(key, 0.0) < IMAGE_PROBE_ERROR_TTL_SECONDS:
+                    results[url] = False
+                elif key not in pending:
+                    pending.append(key)
+
+        if pending:
+            workers = min(self.max_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-probe") as pool:
+                fetched = dict(zip(pending, pool.map(self._fetch, pending)))
+
+            checked_at = time.time()
+            with self._lock:
+                cached = self._load()
+                for key, ok in fetched.items():
+                    if ok is None:
+                        # Sin respuesta definitiva: no ocultar la imagen durante horas
+                        self._errors[key] = checked_at
+                    else:
+                        self._errors.pop(key, None)
+                        cached[key] = (ok, checked_at)
+                self._save()
+
+            for url in urls:
+                if isinstance(url, str) and url.strip() in fetched:
+                    results[url] = bool(fetched[url.strip()])
+
+        return results
+
+    def probe(self, url: str) -> bool:
+        """Devuelve True si la URL responde con una imagen real"""
+        if not url or not isinstance(url, str):
+            return False
+        return self.probe_many([url]).get(url, False)
+
+
+# Instancia global del servicio (singleton)
+_image_probe = None
+_image_probe_lock = threading.Lock()
+
+def get_image_probe() -> ImageProbeService:
+    """Obtiene la instancia global del servicio de validación de imágenes"""
+    global _image_probe
+
+    with _image_probe_lock:
+        if _image_probe is None:
+            _image_probe = ImageProbeService()
+
+    return _image_probe
@@ -0,0 +1,62 @@
+# src/utils/single_flight.py
+# -*- coding: utf-8 -*-
+"""
+Agrupación de peticiones concurrentes ("single-flight")
+
+Si varias sesiones piden a la vez el mismo recurso (misma clave, p. ej. el ID
+de una carpeta de Drive), solo la primera ejecuta la descarga; el resto espera
+y recibe el mismo resultado (o la misma excepción).
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Flight:
+    """Llamada en curso para una clave"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Ejecuta como mucho una llamada en curso por clave dentro del proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Ejecuta fn o se une a la ejecución en curso con la misma clave
+
+        Args:
+            key: Identificador del recurso
+            fn: Función sin argumentos que obtiene el recurso
+
+        Returns:
+            El resultado de fn (compartido entre todas las llamadas agrupadas)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
@@ -74,9 +74,9 @@ def view_players():
                     image_displayed = False
                     
                     # 1. Intentar imagen URL del Excel
-                    if p.get('image_url'):
+                    if p.image_url:
                         try:
-                            st.image(p['image_url'], use_container_width=True)
+                            st.image(p.image_url, use_container_width=True)
                             image_displayed = True
                         except:
                             pass  # Si falla la URL, continuar al fallback
@@ -92,18 +92,14 @@ def view_players():
                     player_name = _create_player_button_content(p)
                     if st.button(
                         label=player_name,
-                        key=f"player_btn_{p.get('slug', idx)}",
+                        key=f"player_btn_{p.slug or idx}",
                         help=f"Ver informe de {player_name}",
                         use_container_width=True
                     ):
-                        set_route("jugador_informe", selected_player=p.get("slug", str(idx)))
+                        set_route("jugador_informe", selected_player=p.slug or str(idx))
 
 
 def _create_player_button_content(player):
     """Crea el contenido de texto simple para el botón del jugador"""
-    # Ahora los datos ya vienen en la estructura correcta
-    number = player.get('number', 0)
-    name = player.get('name', 'N')
-    surnames = player.get('surnames', 'APELLIDOS')
-    
-    return player_label(number, name, surnames)
\ No newline at end of file
+    # Todos los cargadores devuelven Player (mismos campos siempre)
+    return player_label(player.number, player.name or 'N', player.surnames or 'APELLIDOS')
\ No newline at end of file
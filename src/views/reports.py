@@ -3,6 +3,7 @@
 """
 Vistas de informes (equipo y jugador)
 """
+import math
 import streamlit as st
 from ..components import header_bar
 from ..utils import embed_pdf_local, download_button_for_pdf, player_label, set_route
@@ -91,16 +92,20 @@ def view_jugador_informe():
     
     # Cargar datos del jugador
     players = load_players()
-    player = next((p for p in players if p.get("slug") == selected_player), None)
+    player = next((p for p in players if p.slug == selected_player), None)
     
     if not player:
         st.error("Jugador no encontrado")
         return
     
-    st.markdown(f"## 🏀 {player_label(player.get('number', 0), player.get('name', 'Nombre'), player.get('surnames', 'Apellidos'))}")
+    st.markdown(f"## 🏀 {player_label(player.number, player.name or 'Nombre', player.surnames or 'Apellidos')}")
+    
+    # Estadísticas de temporada y percentiles de liga (precalculados para todo el Excel)
+    _show_player_stats(player)
+    _show_percentile_badges(player)
     
     # Mostrar imagen PNG del informe desde Google Drive
-    player_slug = player.get('slug', 'unknown')
+    player_slug = player.slug or 'unknown'
     image_filename = f"{player_slug}.png"
     
     # Intentar obtener la imagen desde Google Drive
@@ -141,7 +146,7 @@ def view_jugador_informe():
             st.download_button(
                 "📄 Descargar informe visual",
                 data=image_to_download.read_bytes(),
-                file_name=f"informe_{player.get('slug', 'unknown')}.png",
+                file_name=f"informe_{player_slug}.png",
                 mime="image/png",
                 use_container_width=True
             )
@@ -153,6 +158,63 @@ def view_jugador_informe():
         st.button("🎬 Ver vídeos de scouting (próximamente)", use_container_width=True, disabled=True)
 
 
+def _format_stat(value, percent: bool = False) -> str:
+    """Formatea una estadística derivada (guion si no se puede calcular)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "–"
+    return f"{value * 100:.1f}%" if percent else f"{value:.1f}"
+
+
+def _show_player_stats(player):
+    """Muestra las principales estadísticas derivadas del jugador"""
+    stats = player.stats
+    if not stats or not player.games_played:
+        return
+    
+    metrics = [
+        ("PTS/P", _format_stat(stats.get('ppg'))),
+        ("MIN/P", _format_stat(stats.get('mpg'))),
+        ("REB/P", _format_stat(stats.get('rpg'))),
+        ("AST/P", _format_stat(stats.get('apg'))),
+        ("eFG%", _format_stat(stats.get('efg_pct'), percent=True)),
+        ("TS%", _format_stat(stats.get('ts_pct'), percent=True)),
+        ("USG%", _format_stat(stats.get('usage_pct'), percent=True)),
+        ("AST/PER", _format_stat(stats.get('ast_to'))),
+    ]
+    for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value)
+    st.caption(f"{player.games_played} partidos · "
+               f"{_format_stat(stats.get('pts_per36'))} puntos por 36 minutos")
+
+
+def _percentile_class(percentile: int) -> str:
+    if percentile >= 70:
+        return "pct-high"
+    if percentile <= 30:
+        return "pct-low"
+    return "pct-mid"
+
+
+def _show_percentile_badges(player):
+    """Muestra el percentil del jugador en la liga y en su fase para cada estadística"""
+    row_id = player.row_id
+    if row_id is None:
+        return
+    
+    from ..data.percentiles import get_percentile_table
+    table = get_percentile_table()
+    percentiles = table.row(row_id)
+    
+    for scope, title in (('league', "Percentil en la liga"), ('phase', f"Percentil en {table.phase_of(row_id)}")):
+        badges = [
+            f"<span class='pct-badge {_percentile_class(values[scope])}'>{values['label']} P{values[scope]}</span>"
+            for values in percentiles.values() if values[scope] is not None
+        ]
+        if badges:
+            st.caption(title)
+            st.markdown(f"<div class='pct-badges'>{''.join(badges)}</div>", unsafe_allow_html=True)
+
+
 def _show_generic_image():
     """Muestra la imagen genérica de usuario con manejo robusto de errores"""
     if GENERIC_USER_IMAGE.exists():
@@ -36,7 +36,8 @@ def get_all_teams() -> List[Dict[str, Any]]:
         if not drive_client or not drive_client.is_authenticated():
             return []
 
-        folders = drive_client.list_folders_in_folder(GOOGLE_DRIVE_ROOT_FOLDER_ID)
+        # Carpetas de equipo desde el catálogo en memoria (sin listar la raíz en cada render)
+        folders = drive_client.catalog_folders(GOOGLE_DRIVE_ROOT_FOLDER_ID)
         teams: List[Dict[str, Any]] = []
         for folder in folders:
             team_name = folder["name"]